@@ -0,0 +1,344 @@
+"""
+DATASET BUILD:
+
+Turns available_unclean_dataset.json into contiguous arrays in a single pass over the tracks, instead of
+formatting every value into csv text row by row:
+    - audio:    (tracks, 154) matrix, columns in feature_schema.feature_columns order
+    - genres:   multi-hot genre labels, bit-packed (see label_bits.py)
+    - seeds:    multi-hot seed labels, bit-packed
+    - metadata: one array per column of feature_schema.metadata_columns
+
+Every derived file is written from those same in-memory arrays, so the JSON is parsed once per build:
+    - music_csv:     music_dataset.csv (metadata, audio features, genre and seed flags)
+    - semantic_csv:  dataset/semantic_data.csv (metadata without spotify_id, genre and seed flags)
+    - audio_npy:     dataset/audio_data.npy (index + audio features, float64)
+    - audio_csv:     dataset/pre_audio_data.csv (index + audio features)
+    - columnar:      dataset/columnar/, one .npy file per column: float32 audio, the bit-packed label
+                     matrices (8 labels a byte), strings as concatenated UTF-8 bytes + int64 offsets
+                     (like an Arrow string column) and schema.json with the dtypes and label vocabularies
+
+build_manifest.json records, per output, the content hash of its inputs (the dataset JSON and the build
+layout) and the size/mtime of what was written. An output whose inputs hash the same and whose file is
+untouched is skipped; when every requested output is current the JSON is not even parsed.
+
+`python server/model/dataset_build.py [music_csv semantic_csv audio_npy audio_csv columnar] [--force]`
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+import label_bits
+from label_vocab import mhe_seeds_dict, mhe_genres_dict
+
+# Audio feature columns come from the shared schema (server/sentiment_model/feature_schema.py)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sentiment_model"))
+from feature_schema import AUDIO_DTYPE, feature_columns, metadata_columns, semantic_columns, metadata_dtypes, audio_matrix
+
+uncleaned_dataset_path = r"server/model/available_unclean_dataset.json"
+manifest_path = r"server/model/dataset/build_manifest.json"
+
+output_paths = {
+    "music_csv": r"server/model/music_dataset.csv",
+    "semantic_csv": r"server/model/dataset/semantic_data.csv",
+    "audio_npy": r"server/model/dataset/audio_data.npy",
+    "audio_csv": r"server/model/dataset/pre_audio_data.csv",
+    "columnar": r"server/model/dataset/columnar",
+}
+
+# Bump when the content of an output changes for the same dataset JSON
+BUILD_VERSION = 1
+
+SCHEMA_FILE = "schema.json"
+
+genre_to_index = {genre.lower(): i for i, genre in enumerate(mhe_genres_dict)}
+seed_to_index = {seed: i for i, seed in enumerate(mhe_seeds_dict)}
+
+# CSV Headers
+csv_headers = list(metadata_columns) + list(feature_columns) + mhe_genres_dict + mhe_seeds_dict
+semantic_csv_headers = list(semantic_columns) + mhe_genres_dict + mhe_seeds_dict
+audio_csv_headers = ["index"] + list(feature_columns)
+
+def load_tracks(path=uncleaned_dataset_path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+# The genre matches case-insensitively, seeds exactly (as the csv flags always did)
+def genre_matrix(tracks):
+    genres = [(track.get("genre") or "").lower() for track in tracks]
+    return label_bits.encode_lists([[genre] for genre in genres], genre_to_index)
+
+def seed_matrix(tracks):
+    return label_bits.encode_lists([track.get("seeds") or () for track in tracks], seed_to_index)
+
+# Metadata columns as parsed (ints stay ints, missing numbers are NaN); the index is the track's position
+def metadata_arrays(tracks):
+    metadata = {}
+    for column, dtype in metadata_dtypes.items():
+        if column == "index":
+            metadata[column] = np.arange(len(tracks), dtype=dtype)
+        elif dtype is object:
+            metadata[column] = np.array([track.get(column) or "" for track in tracks], dtype=object)
+        else:
+            values = np.array([track.get(column) for track in tracks])
+            metadata[column] = values.astype(np.float64) if values.dtype == object else values
+    return metadata
+
+# Every array of the dataset at full precision; the label matrices are bit-packed (tracks, bytes) uint8
+def build_dataset(tracks):
+    return {
+        "audio": audio_matrix(tracks, dtype=np.float64),
+        "genres": genre_matrix(tracks),
+        "seeds": seed_matrix(tracks),
+        "metadata": metadata_arrays(tracks),
+    }
+
+############################################## CSV ################################################
+
+CSV_LINE_END = "\r\n" # csv.writer's default lineterminator
+
+# Python values of a column or matrix, with NaN written as an empty cell (as a missing JSON value was)
+def text_values(array):
+    values = array.tolist()
+    if array.dtype.kind != "f":
+        return values
+
+    missing = np.isnan(array)
+    if array.ndim == 1:
+        for row in np.flatnonzero(missing):
+            values[row] = ""
+    else:
+        for row in np.flatnonzero(missing.any(axis=1)):
+            values[row] = ["" if value != value else value for value in values[row]]
+    return values
+
+# One cell as csv.writer (QUOTE_MINIMAL) writes it
+def csv_cell(value):
+    if isinstance(value, str):
+        if any(char in value for char in ',"\r\n'):
+            return '"' + value.replace('"', '""') + '"'
+        return value
+    return str(value)
+
+def metadata_text(dataset, columns):
+    rows = zip(*(text_values(dataset["metadata"][column]) for column in columns))
+    return [",".join(map(csv_cell, row)) for row in rows]
+
+# Formatting the floats is most of the csv time, so the audio cells are formatted once per build and
+# shared by every csv output
+def audio_text(dataset):
+    if "audio_text" not in dataset:
+        dataset["audio_text"] = [",".join(map(str, row)) for row in text_values(dataset["audio"])]
+    return dataset["audio_text"]
+
+# Genre then seed flags as "0,1,0,..." (one ASCII digit per label, commas in between)
+def label_text(dataset):
+    flags = np.hstack([
+        label_bits.to_flags(dataset["genres"], len(mhe_genres_dict)),
+        label_bits.to_flags(dataset["seeds"], len(mhe_seeds_dict)),
+    ])
+    width = 2 * flags.shape[1] - 1
+
+    cells = np.full((len(flags), width), ord(","), dtype=np.uint8)
+    cells[:, ::2] = flags + ord("0")
+    text = cells.tobytes().decode("ascii")
+
+    return [text[start:start + width] for start in range(0, len(text), width)]
+
+def write_lines(path, headers, lines):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerow(headers)
+        f.writelines(line + CSV_LINE_END for line in lines)
+
+# Semantic and auditory data of every track
+def write_music_csv(dataset, path=output_paths["music_csv"]):
+    rows = zip(metadata_text(dataset, metadata_columns), audio_text(dataset), label_text(dataset))
+    write_lines(path, csv_headers, (",".join(row) for row in rows))
+
+# ONLY the semantics (track/artist are dropped during learning; bring artist back if penalizing)
+def write_semantic_csv(dataset, path=output_paths["semantic_csv"]):
+    rows = zip(metadata_text(dataset, semantic_columns), label_text(dataset))
+    write_lines(path, semantic_csv_headers, (",".join(row) for row in rows))
+
+def write_audio_csv(dataset, path=output_paths["audio_csv"]):
+    rows = zip(metadata_text(dataset, ["index"]), audio_text(dataset))
+    write_lines(path, audio_csv_headers, (",".join(row) for row in rows))
+
+# ONLY the auditory data tensors: index, then the feature columns
+def write_audio_npy(dataset, path=output_paths["audio_npy"]):
+    data_array = np.empty((len(dataset["audio"]), 1 + len(feature_columns)))
+    data_array[:, 0] = dataset["metadata"]["index"]
+    data_array[:, 1:] = dataset["audio"]
+    np.save(path, data_array)
+
+########################################### COLUMNAR FILES ###########################################
+
+def column_file(name):
+    return f"{name}.npy"
+
+def write_strings(path, name, values):
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+
+    np.save(os.path.join(path, column_file(f"{name}.offsets")), offsets)
+    np.save(os.path.join(path, column_file(f"{name}.utf8")), np.frombuffer(b"".join(encoded), dtype=np.uint8))
+
+def read_strings(path, name):
+    offsets = np.load(os.path.join(path, column_file(f"{name}.offsets")))
+    data = np.load(os.path.join(path, column_file(f"{name}.utf8"))).tobytes()
+    return np.array([data[start:end].decode("utf-8") for start, end in zip(offsets[:-1], offsets[1:])], dtype=object)
+
+# Files are written first and schema.json last (atomically), so a reader never sees a half-written build
+def write_columnar(dataset, path=output_paths["columnar"]):
+    os.makedirs(path, exist_ok=True)
+    rows = len(dataset["audio"])
+
+    np.save(os.path.join(path, column_file("audio")), np.ascontiguousarray(dataset["audio"], dtype=AUDIO_DTYPE))
+    for labels in ("genres", "seeds"):
+        np.save(os.path.join(path, column_file(labels)), dataset[labels])
+
+    metadata = {}
+    for column, values in dataset["metadata"].items():
+        if metadata_dtypes[column] is object:
+            write_strings(path, column, values)
+            metadata[column] = "utf8"
+        else:
+            values = values.astype(metadata_dtypes[column])
+            np.save(os.path.join(path, column_file(column)), values)
+            metadata[column] = values.dtype.str
+
+    schema = {
+        "rows": rows,
+        "audio": {"dtype": np.dtype(AUDIO_DTYPE).str, "columns": list(feature_columns)},
+        "genres": {"packed": "bits", "labels": list(mhe_genres_dict)},
+        "seeds": {"packed": "bits", "labels": list(mhe_seeds_dict)},
+        "metadata": metadata,
+    }
+
+    schema_path = os.path.join(path, SCHEMA_FILE)
+    with open(schema_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(schema, f, indent=4)
+    os.replace(schema_path + ".tmp", schema_path)
+
+    return schema
+
+def read_schema(path=output_paths["columnar"]):
+    with open(os.path.join(path, SCHEMA_FILE), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+# The arrays of a columnar build; numeric arrays are memory-mapped unless mmap_mode is None
+# (the label matrices stay packed, see label_bits)
+def read_columnar(path=output_paths["columnar"], mmap_mode="r"):
+    schema = read_schema(path)
+
+    dataset = {"schema": schema}
+    for name in ("audio", "genres", "seeds"):
+        dataset[name] = np.load(os.path.join(path, column_file(name)), mmap_mode=mmap_mode)
+
+    dataset["metadata"] = {
+        column: read_strings(path, column) if dtype == "utf8" else np.load(os.path.join(path, column_file(column)), mmap_mode=mmap_mode)
+        for column, dtype in schema["metadata"].items()
+    }
+
+    return dataset
+
+output_writers = {
+    "music_csv": write_music_csv,
+    "semantic_csv": write_semantic_csv,
+    "audio_npy": write_audio_npy,
+    "audio_csv": write_audio_csv,
+    "columnar": write_columnar,
+}
+
+############################################# MANIFEST #############################################
+
+# Content hash of everything an output is derived from: the dataset JSON and the column layout
+def input_digest(dataset_path):
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps(
+        [BUILD_VERSION, list(feature_columns), list(metadata_columns), mhe_genres_dict, mhe_seeds_dict]
+    ).encode())
+
+    with open(dataset_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+# Size and mtime of an output file (or of every file of an output directory)
+def output_stamp(path):
+    if os.path.isdir(path):
+        return sorted([entry.name, entry.stat().st_size, entry.stat().st_mtime_ns] for entry in os.scandir(path))
+    if os.path.isfile(path):
+        return [os.path.getsize(path), os.stat(path).st_mtime_ns]
+    return None
+
+def read_manifest(path=manifest_path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def write_manifest(manifest, path=manifest_path):
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=4)
+    os.replace(path + ".tmp", path)
+
+# An output is current when it was built from the same inputs and nobody touched it since
+def is_current(manifest, name, path, digest):
+    entry = manifest.get(name)
+    stamp = output_stamp(path)
+    return entry is not None and stamp is not None and entry["input"] == digest and entry["stamp"] == stamp
+
+# Build the requested outputs that are stale (all of them with force); returns the names that were written
+def build(outputs=tuple(output_writers), dataset_path=uncleaned_dataset_path, paths=None, force=False,
+          manifest_file=manifest_path):
+    paths = {**output_paths, **(paths or {})}
+    digest = input_digest(dataset_path)
+    manifest = read_manifest(manifest_file)
+
+    stale = [name for name in outputs if force or not is_current(manifest, name, paths[name], digest)]
+    if not stale:
+        return []
+
+    # One parse for every stale output
+    dataset = build_dataset(load_tracks(dataset_path))
+
+    for name in stale:
+        path = paths[name]
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        output_writers[name](dataset, path)
+
+        manifest[name] = {"input": digest, "stamp": output_stamp(path), "path": path}
+        write_manifest(manifest, manifest_file)
+
+    return stale
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("outputs", nargs="*", help=f"Any of {', '.join(output_writers)} (defaults to all)")
+    parser.add_argument("--dataset", default=uncleaned_dataset_path)
+    parser.add_argument("--manifest", default=manifest_path)
+    parser.add_argument("--force", action="store_true", help="Rebuild even if the inputs are unchanged")
+    args = parser.parse_args()
+
+    outputs = args.outputs or list(output_writers)
+    unknown = [name for name in outputs if name not in output_writers]
+    if unknown:
+        parser.error(f"unknown outputs: {', '.join(unknown)}")
+
+    start = time.perf_counter()
+    built = build(outputs, args.dataset, force=args.force, manifest_file=args.manifest)
+    elapsed = time.perf_counter() - start
+
+    for name in outputs:
+        print(f"{name}: {'built' if name in built else 'up to date'} ({output_paths[name]})")
+    print(f"Done in {elapsed:.2f}s")
@@ -0,0 +1,102 @@
+"""
+LABEL BITS:
+
+Bit-packed multi-hot labels. A track's genres or seeds are one row of bits (label i is bit i, in
+np.packbits order: byte i // 8, most significant bit first), so the ~280 seeds of a track take 36 bytes
+instead of 280 float64 zeros and ones, and the set operations work on whole bytes at once:
+    - intersection / union:  bitwise and / or of the rows
+    - counts:                popcount of the row
+    - jaccard:               |a & b| / |a | b|
+
+Rows can be converted to and from dense 0/1 flags (to_flags/from_flags) and CSR label indices
+(to_csr/from_csr). Everything takes a (tracks, bytes) matrix, or a single row, and broadcasts like NumPy.
+"""
+
+import numpy as np
+
+PACKED_DTYPE = np.uint8
+
+# Bits set per byte value, for NumPy versions without np.bitwise_count
+_byte_counts = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+def packed_width(label_count):
+    return (label_count + 7) // 8
+
+# Packed rows from each row's label indices (codes[lengths[0]:...] belong to row 0, and so on; -1 is skipped)
+def encode(codes, lengths, label_count):
+    codes = np.asarray(codes, dtype=np.int64)
+    lengths = np.asarray(lengths, dtype=np.int64)
+
+    packed = np.zeros((len(lengths), packed_width(label_count)), dtype=PACKED_DTYPE)
+    rows = np.repeat(np.arange(len(lengths)), lengths)
+
+    known = codes >= 0
+    rows, codes = rows[known], codes[known]
+    np.bitwise_or.at(packed, (rows, codes >> 3), (0x80 >> (codes & 7)).astype(PACKED_DTYPE))
+
+    return packed
+
+# Packed rows of label lists, e.g. every track's seeds (labels missing from label_to_index are skipped)
+def encode_lists(label_lists, label_to_index):
+    lengths = np.fromiter(map(len, label_lists), dtype=np.int64, count=len(label_lists))
+    codes = np.fromiter(
+        (label_to_index.get(label, -1) for labels in label_lists for label in labels), dtype=np.int64, count=lengths.sum()
+    )
+    return encode(codes, lengths, len(label_to_index))
+
+def from_flags(flags):
+    return np.packbits(np.asarray(flags, dtype=bool), axis=-1)
+
+# (..., label_count) uint8 0/1 flags
+def to_flags(packed, label_count):
+    return np.unpackbits(packed, axis=-1, count=label_count)
+
+# (indptr, indices): the labels of row r are indices[indptr[r]:indptr[r + 1]], in label order
+def to_csr(packed, label_count):
+    rows, indices = np.nonzero(to_flags(packed, label_count))
+    indptr = np.zeros(len(packed) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=len(packed)), out=indptr[1:])
+    return indptr, indices
+
+def from_csr(indptr, indices, label_count):
+    return encode(indices, np.diff(indptr), label_count)
+
+def popcount(packed):
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(packed).sum(axis=-1, dtype=np.int64)
+    return _byte_counts[packed].sum(axis=-1, dtype=np.int64)
+
+def intersection(a, b):
+    return np.bitwise_and(a, b)
+
+def union(a, b):
+    return np.bitwise_or(a, b)
+
+def intersection_count(a, b):
+    return popcount(np.bitwise_and(a, b))
+
+# |a & b| / |a | b| per row pair; two empty rows share nothing (0.0)
+def jaccard(a, b):
+    shared = intersection_count(a, b)
+    either = popcount(np.bitwise_or(a, b))
+    return shared / np.maximum(either, 1)
+
+# Rows of `a` per block of a pairwise op, so the (block, len(b), bytes) intermediate stays around max_bytes
+def _block_rows(b, max_bytes):
+    return max(1, max_bytes // max(1, b.shape[0] * b.shape[1]))
+
+# (len(a), len(b)) matrix of |a[i] & b[j]|
+def pairwise_intersection_count(a, b, max_bytes=64 * 1024**2):
+    counts = np.empty((len(a), len(b)), dtype=np.int64)
+    step = _block_rows(b, max_bytes)
+
+    for start in range(0, len(a), step):
+        counts[start:start + step] = intersection_count(a[start:start + step, None, :], b[None, :, :])
+
+    return counts
+
+# (len(a), len(b)) matrix of jaccard(a[i], b[j])
+def pairwise_jaccard(a, b, max_bytes=64 * 1024**2):
+    shared = pairwise_intersection_count(a, b, max_bytes)
+    either = popcount(a)[:, None] + popcount(b)[None, :] - shared
+    return shared / np.maximum(either, 1)
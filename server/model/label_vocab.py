@@ -0,0 +1,739 @@
+"""
+LABEL VOCABULARY:
+
+The seed (mood) and genre labels of the multi-hot encoded columns, in column order. Kept apart from
+webcrawl_cleansing.py (which loads the whole dataset when it runs) so that dataset_build.py and the
+training scripts can import the vocabulary on its own.
+"""
+
+############################################ SEEDS ###############################################
+import numpy as np
+
+mhe_seeds_dict = [
+    "acerbic",
+    "aggressive",
+    "agreeable",
+    "airy",
+    "ambitious",
+    "amiable/good-natured",
+    "angry",
+    "angst-ridden",
+    "anguished/distraught",
+    "angular",
+    "animated",
+    "anthemic",
+    "apocalyptic",
+    "arid",
+    "athletic",
+    "atmospheric",
+    "austere",
+    "autumnal",
+    "belligerent",
+    "benevolent",
+    "bitter",
+    "bittersweet",
+    "bleak",
+    "boisterous",
+    "bombastic",
+    "bouncy",
+    "brash",
+    "brassy",
+    "bravado",
+    "bright",
+    "brittle",
+    "brooding",
+    "calm/peaceful",
+    "campy",
+    "capricious",
+    "carefree",
+    "cartoonish",
+    "cathartic",
+    "celebratory",
+    "cerebral",
+    "cheerful",
+    "child-like",
+    "circular",
+    "clinical",
+    "cold",
+    "comic",
+    "complex",
+    "concise",
+    "confessional",
+    "confident",
+    "confrontational",
+    "cosmopolitan",
+    "crunchy",
+    "cute",
+    "cynical/sarcastic",
+    "dark",
+    "declamatory",
+    "defiant",
+    "delicate",
+    "demonic",
+    "desperate",
+    "detached",
+    "devotional",
+    "difficult",
+    "dignified/noble",
+    "dissonant",
+    "dramatic",
+    "dreamy",
+    "driving",
+    "druggy",
+    "earnest",
+    "earthy",
+    "ebullient",
+    "eccentric",
+    "ecstatic",
+    "eerie",
+    "effervescent",
+    "elaborate",
+    "elegant",
+    "elegiac",
+    "energetic",
+    "enigmatic",
+    "epic",
+    "erotic",
+    "ethereal",
+    "euphoric",
+    "exciting",
+    "exotic",
+    "exploratory",
+    "explosive",
+    "extroverted",
+    "exuberant",
+    "fantastic/fantasy-like",
+    "feral",
+    "feverish",
+    "fierce",
+    "fiery",
+    "flashy",
+    "flowing",
+    "fractured",
+    "freewheeling",
+    "fun",
+    "funereal",
+    "gentle",
+    "giddy",
+    "gleeful",
+    "gloomy",
+    "graceful",
+    "greasy",
+    "grim",
+    "gritty",
+    "gutsy",
+    "happy",
+    "harsh",
+    "heavy",
+    "hedonistic",
+    "heroic",
+    "hostile",
+    "humorous",
+    "hungry",
+    "hymn-like",
+    "hyper",
+    "hypnotic",
+    "improvisatory",
+    "indulgent",
+    "innocent",
+    "insular",
+    "intense",
+    "intimate",
+    "introspective",
+    "ironic",
+    "irreverent",
+    "jovial",
+    "joyous",
+    "kinetic",
+    "knotty",
+    "laid-back/mellow",
+    "languid",
+    "lazy",
+    "light",
+    "literate",
+    "lively",
+    "lonely",
+    "loose",
+    "lush",
+    "lyrical",
+    "macabre",
+    "magical",
+    "majestic",
+    "malevolent",
+    "manic",
+    "marching",
+    "martial",
+    "meandering",
+    "mechanical",
+    "meditative",
+    "melancholy",
+    "melodic",
+    "menacing",
+    "messy",
+    "mighty",
+    "monastic",
+    "monumental",
+    "motoric",
+    "mysterious",
+    "mystical",
+    "naive",
+    "narcotic",
+    "narrative",
+    "negative",
+    "nervous/jittery",
+    "nihilistic",
+    "nocturnal",
+    "nostalgic",
+    "ominous",
+    "optimistic",
+    "opulent",
+    "organic",
+    "ornate",
+    "outraged",
+    "outrageous",
+    "paranoid",
+    "passionate",
+    "pastoral",
+    "patriotic",
+    "perky",
+    "philosophical",
+    "plain",
+    "plaintive",
+    "playful",
+    "poetic",
+    "poignant",
+    "positive",
+    "powerful",
+    "precious",
+    "provocative",
+    "pulsing",
+    "pure",
+    "quaint",
+    "quirky",
+    "radiant",
+    "rambunctious",
+    "ramshackle",
+    "raucous",
+    "reassuring/consoling",
+    "rebellious",
+    "reckless",
+    "refined",
+    "reflective",
+    "regretful",
+    "relaxed",
+    "reserved",
+    "resolute",
+    "restrained",
+    "reverent",
+    "rhapsodic",
+    "rollicking",
+    "romantic",
+    "rousing",
+    "rowdy",
+    "rustic",
+    "sacred",
+    "sad",
+    "sarcastic",
+    "sardonic",
+    "satirical",
+    "savage",
+    "scary",
+    "scattered",
+    "searching",
+    "seductive",
+    "self-conscious",
+    "sensual",
+    "sentimental",
+    "serious",
+    "severe",
+    "sexual",
+    "sexy",
+    "shimmering",
+    "silly",
+    "sleazy",
+    "slick",
+    "smooth",
+    "snide",
+    "soft/quiet",
+    "somber",
+    "soothing",
+    "sophisticated",
+    "spacey",
+    "spacious",
+    "sparkling",
+    "sparse",
+    "spicy",
+    "spiritual",
+    "spontaneous",
+    "spooky",
+    "sprawling",
+    "sprightly",
+    "springlike",
+    "stately",
+    "street-smart",
+    "striding",
+    "strong",
+    "stylish",
+    "suffocating",
+    "sugary",
+    "summery",
+    "sunny",
+    "suspenseful",
+    "swaggering",
+    "sweet",
+    "swinging",
+    "technical",
+    "tender",
+    "tense/anxious",
+    "theatrical",
+    "thoughtful",
+    "threatening",
+    "thrilling",
+    "tight",
+    "tough",
+    "tragic",
+    "transparent/translucent",
+    "trashy",
+    "trippy",
+    "triumphant",
+    "turbulent",
+    "uncompromising",
+    "understated",
+    "unsettling",
+    "uplifting",
+    "urgent",
+    "virile",
+    "visceral",
+    "volatile",
+    "vulgar",
+    "vulnerable",
+    "warm",
+    "weary",
+    "whimsical",
+    "wintry",
+    "wistful",
+    "witty",
+    "wry",
+    "yearning",
+]
+
+
+# Developing multi-hot encoding (MHE) for seeds
+def mhe_encoding_seeds(track_seeds, seed_to_index):
+    vector = np.zeros(len(seed_to_index))
+    for seed in track_seeds:
+        if seed in seed_to_index:
+            vector[seed_to_index[seed]] = 1
+    return vector
+
+
+############################################ GENRES ###############################################
+
+mhe_genres_dict = [
+    "rap",
+    "metal",
+    "hip-hop",
+    "nu metal",
+    "singer-songwriter",
+    "punk",
+    "industrial",
+    "metalcore",
+    "alternative metal",
+    "classic rock",
+    "electroclash",
+    "rock",
+    "post-hardcore",
+    "progressive metal",
+    "indie rock",
+    "indie pop",
+    "indie",
+    "pop",
+    "post-punk",
+    "thrash metal",
+    "industrial metal",
+    "gothic metal",
+    "death metal",
+    "alternative rock",
+    "screamo",
+    "noise rock",
+    "electronic",
+    "riot grrrl",
+    "electro",
+    "symphonic metal",
+    "grunge",
+    "trip-hop",
+    "hard rock",
+    "breakbeat",
+    "melodic death metal",
+    "hip hop",
+    "hardcore",
+    "alternative",
+    "experimental",
+    "country",
+    "stoner rock",
+    "horrorcore",
+    "ska",
+    "black metal",
+    "dark electro",
+    "redneck",
+    "hardcore punk",
+    "stoner metal",
+    "ambient",
+    "underground hip hop",
+    "math rock",
+    "grindcore",
+    "doom metal",
+    "noise pop",
+    "emo",
+    "deathcore",
+    "ebm",
+    "post-metal",
+    "goth",
+    "bluegrass",
+    "british",
+    "christian metal",
+    "soul",
+    "industrial rock",
+    "folk",
+    "digital hardcore",
+    "post-rock",
+    "visual kei",
+    "dance",
+    "britpop",
+    "german",
+    "mathcore",
+    "blues rock",
+    "melodic hardcore",
+    "minimal techno",
+    "new wave",
+    "avant-garde",
+    "pop punk",
+    "groove metal",
+    "christian rock",
+    "j-rock",
+    "funk",
+    "breakcore",
+    "folk metal",
+    "crust punk",
+    "funk metal",
+    "acoustic",
+    "oi",
+    "soundtrack",
+    "idm",
+    "melodic black metal",
+    "drum and bass",
+    "anime",
+    "electro-industrial",
+    "blues",
+    "k-pop",
+    "d-beat",
+    "aggrotech",
+    "dubstep",
+    "rockabilly",
+    "house",
+    "power metal",
+    "art pop",
+    "progressive rock",
+    "noise",
+    "gothic rock",
+    "sludge metal",
+    "psychobilly",
+    "electronic rock",
+    "spanish",
+    "piano rock",
+    "piano",
+    "dark cabaret",
+    "experimental rock",
+    "horror punk",
+    "lo-fi",
+    "dance rock",
+    "folk punk",
+    "summer",
+    "comedy",
+    "jazz",
+    "depressive black metal",
+    "poetry",
+    "cybergrind",
+    "pop rock",
+    "powerviolence",
+    "sad",
+    "finnish metal",
+    "classical",
+    "electronica",
+    "grime",
+    "shoegaze",
+    "crunk",
+    "guitar",
+    "rock en espanol",
+    "slowcore",
+    "violin",
+    "spoken word",
+    "neofolk",
+    "psychedelic rock",
+    "canadian rock",
+    "dream pop",
+    "technical death metal",
+    "madchester",
+    "garage rock",
+    "drone",
+    "progressive black metal",
+    "downtempo",
+    "french",
+    "synthwave",
+    "worship",
+    "contemporary classical",
+    "zeuhl",
+    "vocal trance",
+    "mpb",
+    "latin",
+    "trance",
+    "techno",
+    "chill",
+    "cabaret",
+    "ambient pop",
+    "breaks",
+    "r&b",
+    "world",
+    "krautrock",
+    "reggae",
+    "boogie",
+    "soft rock",
+    "washboard",
+    "video game music",
+    "disco",
+    "minimal synth",
+    "dark ambient",
+    "art rock",
+    "medieval",
+    "darkstep",
+    "erhu",
+    "hardstyle",
+    "j-pop",
+    "groove",
+    "garage",
+    "martial industrial",
+    "russian alternative",
+    "minimalism",
+    "new weird america",
+    "symphonic rock",
+    "atmospheric black metal",
+    "jungle",
+    "neoclassical darkwave",
+    "deathrock",
+    "psychedelic pop",
+    "experimental folk",
+    "trip hop",
+    "progressive house",
+    "ritual ambient",
+    "celtic",
+    "free jazz",
+    "water",
+    "cyberpunk",
+    "halloween",
+    "soundtracks",
+    "orchestra",
+    "skate punk",
+    "teen pop",
+    "afrobeat",
+    "new age",
+    "electropop",
+    "dancehall",
+    "quran",
+    "atmosphere",
+    "a cappella",
+    "southern rock",
+    "happy",
+    "french rock",
+    "funk carioca",
+    "electro house",
+    "world fusion",
+    "garage punk",
+    "underground rap",
+    "choral",
+    "folktronica",
+    "latin rock",
+    "brazil",
+    "symphonic death metal",
+    "glitch hop",
+    "drone metal",
+    "synthpop",
+    "hard trance",
+    "glam rock",
+    "meme rap",
+    "bossa nova",
+    "witch house",
+    "sleep",
+    "dark jazz",
+    "post-black metal",
+    "trap",
+    "dark wave",
+    "cello",
+    "harp",
+    "hip house",
+    "hauntology",
+    "easy listening",
+    "acid jazz",
+    "futurepop",
+    "western swing",
+    "melodic rap",
+    "ambient black metal",
+    "glitch",
+    "music box",
+    "avant-garde jazz",
+    "indietronica",
+    "accordion",
+    "lullaby",
+    "deep ambient",
+    "disney",
+    "psychedelic trance",
+    "alternative country",
+    "folk rock",
+    "lounge",
+    "beats",
+    "alternative pop",
+    "dub",
+    "abstract",
+    "minimal wave",
+    "space rock",
+    "nu jazz",
+    "uk garage",
+    "coldwave",
+    "turntablism",
+    "lilith",
+    "power electronics",
+    "swing",
+    "northern soul",
+    "kids",
+    "novelty",
+    "steampunk",
+    "calypso",
+    "russian rock",
+    "goregrind",
+    "gypsy",
+    "ccm",
+    "neurofunk",
+    "tango",
+    "west coast rap",
+    "celtic rock",
+    "chanson",
+    "alternative dance",
+    "8-bit",
+    "french pop",
+    "nederpop",
+    "outsider",
+    "swedish",
+    "chamber pop",
+    "vocal jazz",
+    "ukulele",
+    "indie folk",
+    "chillwave",
+    "praise",
+    "songwriter",
+    "tex-mex",
+    "native american",
+    "meditation",
+    "smooth jazz",
+    "psychill",
+    "organic ambient",
+    "big beat",
+    "opera",
+    "zen",
+    "noisecore",
+    "djent",
+    "bachata",
+    "freak folk",
+    "balearic",
+    "ska punk",
+    "romance",
+    "power pop",
+    "houston rap",
+    "vaporwave",
+    "post-grunge",
+    "rock nacional",
+    "chillstep",
+    "ambient industrial",
+    "dark folk",
+    "jazz fusion",
+    "mandolin",
+    "jangle pop",
+    "broken beat",
+    "klezmer",
+    "street punk",
+    "doo-wop",
+    "motown",
+    "merseybeat",
+    "straight edge",
+    "gospel",
+    "chiptune",
+    "polka",
+    "jam band",
+    "minecraft",
+    "gypsy punk",
+    "parody",
+    "suomisaundi",
+    "gypsy jazz",
+    "rhythm and blues",
+    "samba",
+    "merengue",
+    "baroque",
+    "taiko",
+    "spanish classical",
+    "hawaiian",
+    "flamenco",
+    "rumba",
+    "fado",
+    "schlager",
+    "turkish",
+    "latin jazz",
+    "fingerstyle",
+    "qawwali",
+    "broadway",
+    "focus",
+    "rave",
+    "crack rock steady",
+    "big band",
+    "contemporary jazz",
+    "party",
+    "freestyle",
+    "latin pop",
+    "progressive breaks",
+    "eurodance",
+    "no wave",
+    "brass band",
+    "modern rock",
+    "club",
+    "polish rock",
+    "celtic punk",
+    "soca",
+    "boogaloo",
+    "neo soul",
+    "electro jazz",
+    "psychedelic folk",
+    "indian",
+    "garage rock revival",
+    "tropicalia",
+    "jazz funk",
+    "anti-folk",
+    "future garage",
+    "demoscene",
+    "goa trance",
+    "progressive trance",
+    "moog",
+    "deep house",
+    "space age pop",
+    "tech house",
+    "yoga",
+    "deep techno",
+    "sufi",
+    "dark disco",
+    "new jack swing",
+]
+
+
+# Developing multi-hot encoding (MHE) for genres
+def mhe_encoding_genres(track_genres, genre_to_index):
+    vector = np.zeros(len(genre_to_index))
+    for genre in track_genres:
+        if genre in genre_to_index:
+            vector[genre_to_index[genre]] = 1
+    return vector
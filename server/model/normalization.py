@@ -0,0 +1,272 @@
+"""
+NORMALIZATION:
+
+Streaming normalization of the dataset, with the statistics kept next to the results.
+
+    - normalized_audio.npy:            float32 (tracks, 1 + 154): the index, then every feature column as
+                                       (x - mean) / std. Open it with open_normalized_audio() (mmap_mode),
+                                       so a reader only pages in the rows it touches.
+    - normalized_audio_stats.json:     running statistics of every feature column
+    - normalized_semantic.csv:         the semantic csv with valence/arousal/dominance min-max scaled
+    - normalized_semantic_stats.json:  running statistics of those tag columns
+
+The statistics are RunningStats: per column the count, mean and sum of squared deviations (Welford's
+update, merged a chunk at a time with Chan et al.'s formula) plus the running min and max. Nothing ever
+needs the whole table in memory: the csv files are read in CHUNK_ROWS chunks, once for the statistics
+and once to write the normalized rows.
+
+New tracks can be added two ways:
+    - append_normalized_audio:  normalized against the stored statistics as they are (nothing else changes)
+    - add_normalized_audio:     folded into the statistics; the rows already in the matrix are re-emitted
+                                in place with an affine per-column rescale, chunk by chunk, instead of
+                                re-reading the csv
+"""
+
+import io
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Audio feature columns come from the shared schema (server/sentiment_model/feature_schema.py)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sentiment_model"))
+from feature_schema import AUDIO_DTYPE, feature_columns
+
+audio_csv_path = r"server/model/dataset/pre_audio_data.csv"
+semantic_csv_path = r"server/model/dataset/semantic_data.csv"
+normalized_audio_path = r"server/model/dataset/normalized_audio.npy"
+normalized_semantic_path = r"server/model/dataset/normalized_semantic.csv"
+audio_stats_path = r"server/model/dataset/normalized_audio_stats.json"
+semantic_stats_path = r"server/model/dataset/normalized_semantic_stats.json"
+
+# Min-max scaled semantic columns
+vad_columns = ["valence_tags", "arousal_tags", "dominance_tags"]
+
+CHUNK_ROWS = 4096 # Rows read, normalized or rescaled per step
+
+# Mean/std/min/max per column, updated a chunk of rows at a time; missing values (NaN) are skipped
+class RunningStats:
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self.count = np.zeros(len(self.columns), dtype=np.int64)
+        self.mean = np.zeros(len(self.columns))
+        self.m2 = np.zeros(len(self.columns)) # Sum of squared deviations from the mean
+        self.min = np.full(len(self.columns), np.inf)
+        self.max = np.full(len(self.columns), -np.inf)
+
+    def update(self, chunk):
+        chunk = np.asarray(chunk, dtype=np.float64).reshape(-1, len(self.columns))
+        valid = ~np.isnan(chunk)
+
+        count = valid.sum(axis=0)
+        mean = np.where(valid, chunk, 0.0).sum(axis=0) / np.maximum(count, 1)
+        m2 = np.where(valid, chunk - mean, 0.0)
+        m2 = (m2 * m2).sum(axis=0)
+
+        # Merge the chunk's (count, mean, m2) into the running ones
+        total = self.count + count
+        delta = mean - self.mean
+        weight = count / np.maximum(total, 1)
+
+        self.mean = self.mean + delta * weight
+        self.m2 = self.m2 + m2 + delta * delta * self.count * weight
+        self.count = total
+
+        # fmin/fmax skip NaN
+        self.min = np.fmin(self.min, np.fmin.reduce(chunk, axis=0, initial=np.inf))
+        self.max = np.fmax(self.max, np.fmax.reduce(chunk, axis=0, initial=-np.inf))
+        return self
+
+    # Sample std (ddof=1, like pandas); NaN for columns with fewer than two values
+    @property
+    def std(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.count > 1, np.sqrt(self.m2 / (self.count - 1)), np.nan)
+
+    def to_json(self):
+        return {
+            "columns": self.columns,
+            "count": self.count.tolist(),
+            "mean": self.mean.tolist(),
+            "m2": self.m2.tolist(),
+            "std": self.std.tolist(),
+            "min": self.min.tolist(),
+            "max": self.max.tolist(),
+        }
+
+    @classmethod
+    def from_json(cls, data):
+        stats = cls(data["columns"])
+        stats.count = np.asarray(data["count"], dtype=np.int64)
+        for name in ("mean", "m2", "min", "max"):
+            setattr(stats, name, np.asarray(data[name], dtype=np.float64))
+        return stats
+
+    def copy(self):
+        return RunningStats.from_json(self.to_json())
+
+def save_stats(stats, path=audio_stats_path):
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(stats.to_json(), f, indent=4)
+    os.replace(path + ".tmp", path)
+
+def load_stats(path=audio_stats_path, columns=feature_columns):
+    with open(path, "r", encoding="utf-8") as f:
+        stats = RunningStats.from_json(json.load(f))
+
+    if stats.columns != list(columns):
+        raise ValueError(f"{path} was computed for different columns")
+    return stats
+
+def fit_audio_stats(features):
+    return RunningStats(feature_columns).update(features)
+
+############################################## CHUNKS ##############################################
+
+# (index, features) chunks of pre_audio_data.csv
+def audio_chunks(path=audio_csv_path, chunk_rows=CHUNK_ROWS):
+    for chunk in pd.read_csv(path, chunksize=chunk_rows):
+        yield chunk["index"].to_numpy(), chunk[list(feature_columns)].to_numpy(dtype=np.float64)
+
+def semantic_chunks(path=semantic_csv_path, chunk_rows=CHUNK_ROWS):
+    yield from pd.read_csv(path, chunksize=chunk_rows)
+
+############################################### AUDIO ###############################################
+
+# Std used for scaling: a constant column is left at 0 instead of dividing by zero
+def _scale(std):
+    return np.where(std > 0, std, 1.0)
+
+# (rows, 1 + features) float32: the index, then the z-scored features
+def normalize_rows(index, features, stats, out=None):
+    if out is None:
+        out = np.empty((len(features), 1 + len(feature_columns)), dtype=AUDIO_DTYPE)
+
+    out[:, 0] = index
+    out[:, 1:] = (np.asarray(features, dtype=np.float64) - stats.mean) / _scale(stats.std)
+    return out
+
+# Write (index, features) chunks normalized with `stats` into a new matrix of `rows` rows
+def write_normalized_audio(chunks, rows, stats, path=normalized_audio_path):
+    matrix = np.lib.format.open_memmap(path, mode="w+", dtype=AUDIO_DTYPE, shape=(rows, 1 + len(feature_columns)))
+
+    start = 0
+    for index, features in chunks:
+        normalize_rows(index, features, stats, out=matrix[start:start + len(features)])
+        start += len(features)
+
+    matrix.flush()
+    del matrix
+
+def open_normalized_audio(path=normalized_audio_path, mmap_mode="r"):
+    return np.load(path, mmap_mode=mmap_mode)
+
+# Re-emit normalized rows for new statistics in place: z' = (z * std + mean - mean') / std'
+def rescale_normalized_audio(old_stats, new_stats, path=normalized_audio_path, chunk_rows=CHUNK_ROWS):
+    gain = _scale(old_stats.std) / _scale(new_stats.std)
+    shift = (old_stats.mean - new_stats.mean) / _scale(new_stats.std)
+
+    matrix = open_normalized_audio(path, mmap_mode="r+")
+    for start in range(0, len(matrix), chunk_rows):
+        rows = matrix[start:start + chunk_rows, 1:]
+        rows[:] = rows * gain + shift
+
+    matrix.flush()
+    del matrix
+
+def _npy_header(shape, dtype):
+    header = io.BytesIO()
+    np.lib.format.write_array_header_1_0(
+        header, {"descr": np.lib.format.dtype_to_descr(np.dtype(dtype)), "fortran_order": False, "shape": shape}
+    )
+    return header.getvalue()
+
+# Add normalized rows to the end of the matrix. The rows are written before the header grows, so an
+# interrupted append leaves the old matrix intact.
+def _append_rows(rows, path):
+    existing = open_normalized_audio(path)
+    shape, offset, dtype = existing.shape, existing.offset, existing.dtype
+    del existing
+
+    if dtype != rows.dtype or shape[1:] != rows.shape[1:]:
+        raise ValueError(f"{path} holds {dtype} rows of {shape[1:]}, not {rows.dtype} rows of {rows.shape[1:]}")
+
+    new_shape = (shape[0] + len(rows),) + shape[1:]
+    header = _npy_header(new_shape, dtype)
+
+    # The header is padded to a fixed size, so it is rewritten in place unless the shape outgrew the padding
+    if len(header) != offset:
+        matrix = np.concatenate([open_normalized_audio(path, mmap_mode=None), rows])
+        np.save(path + ".tmp.npy", matrix)
+        os.replace(path + ".tmp.npy", path)
+        return new_shape
+
+    with open(path, "r+b") as f:
+        f.seek(offset + shape[0] * rows.itemsize * rows.shape[1])
+        f.write(rows.tobytes())
+        f.truncate()
+        f.flush()
+        os.fsync(f.fileno())
+
+        f.seek(0)
+        f.write(header)
+
+    return new_shape
+
+# Normalize new tracks with the stored statistics (left unchanged) and append them
+def append_normalized_audio(index, features, path=normalized_audio_path, stats_path=audio_stats_path):
+    return _append_rows(normalize_rows(index, features, load_stats(stats_path)), path)
+
+# Fold new tracks into the statistics, rescale the rows already normalized and append the new ones.
+# The statistics are saved last: after an interruption, rerun normalize_dataset().
+def add_normalized_audio(index, features, path=normalized_audio_path, stats_path=audio_stats_path):
+    old_stats = load_stats(stats_path)
+    new_stats = old_stats.copy().update(features)
+
+    rescale_normalized_audio(old_stats, new_stats, path)
+    shape = _append_rows(normalize_rows(index, features, new_stats), path)
+    save_stats(new_stats, stats_path)
+
+    return shape
+
+############################################# SEMANTIC #############################################
+
+# X' = (X - X_min) / (X_max - X_min)
+def scale_semantic(chunk, stats):
+    chunk = chunk.copy()
+    chunk[vad_columns] = (chunk[vad_columns] - stats.min) / (stats.max - stats.min)
+    return chunk
+
+# Write the semantic chunks with the VAD columns scaled (the csv keeps the row numbers, like to_csv did)
+def write_normalized_semantic(chunks, stats, path=normalized_semantic_path):
+    header = True
+    for chunk in chunks:
+        scale_semantic(chunk, stats).to_csv(path, mode="w" if header else "a", header=header)
+        header = False
+
+############################################# DATASET #############################################
+
+# Two passes over the csv files (statistics, then the normalized rows), one chunk in memory at a time
+def normalize_dataset(audio_csv=audio_csv_path, semantic_csv=semantic_csv_path,
+                      normalized_audio=normalized_audio_path, normalized_semantic=normalized_semantic_path,
+                      audio_stats_file=audio_stats_path, semantic_stats_file=semantic_stats_path,
+                      chunk_rows=CHUNK_ROWS):
+    audio_stats = RunningStats(feature_columns)
+    rows = 0
+    for _, features in audio_chunks(audio_csv, chunk_rows):
+        audio_stats.update(features)
+        rows += len(features)
+
+    semantic_stats = RunningStats(vad_columns)
+    for chunk in semantic_chunks(semantic_csv, chunk_rows):
+        semantic_stats.update(chunk[vad_columns].to_numpy(dtype=np.float64))
+
+    write_normalized_audio(audio_chunks(audio_csv, chunk_rows), rows, audio_stats, normalized_audio)
+    write_normalized_semantic(semantic_chunks(semantic_csv, chunk_rows), semantic_stats, normalized_semantic)
+
+    save_stats(audio_stats, audio_stats_file)
+    save_stats(semantic_stats, semantic_stats_file)
+
+    return audio_stats, semantic_stats
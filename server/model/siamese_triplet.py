@@ -14,7 +14,8 @@ Docstring for server.model.siamese_triplet
 import csv
 import json
 import pandas as pd
-import numpy as np
+
+from normalization import normalize_dataset, open_normalized_audio
 
 genre_classes_path = r"server\model\genre_classifications.json"
 dataset_path = r"server\model\music_dataset.csv"
@@ -54,193 +55,17 @@ def normalize():
     semantic_csv_path = r"server\model\dataset\semantic_data.csv"
     audio_csv_path = r"server\model\dataset\pre_audio_data.csv"
 
-    semantic_df = pd.read_csv(semantic_csv_path)
-    audio_df = pd.read_csv(audio_csv_path)
-
-    ### Audio Normalization ###
-    audio_cols_to_norm = [
-        "tempo",
-        "tempo_bt",
-        "rms_mean",
-        "rms_std",
-        "rms_min",
-        "rms_max",
-        "zcr_mean",
-        "zcr_std",
-        "zcr_min",
-        "zcr_max",
-        "spec_centroid_mean",
-        "spec_centroid_std",
-        "spec_centroid_min",
-        "spec_centroid_max",
-        "spec_bandwidth_mean",
-        "spec_bandwidth_std",
-        "spec_bandwidth_min",
-        "spec_bandwidth_max",
-        "spec_contrast_1_mean",
-        "spec_contrast_1_std",
-        "spec_contrast_1_min",
-        "spec_contrast_1_max",
-        "spec_contrast_2_mean",
-        "spec_contrast_2_std",
-        "spec_contrast_2_min",
-        "spec_contrast_2_max",
-        "spec_contrast_3_mean",
-        "spec_contrast_3_std",
-        "spec_contrast_3_min",
-        "spec_contrast_3_max",
-        "spec_contrast_4_mean",
-        "spec_contrast_4_std",
-        "spec_contrast_4_min",
-        "spec_contrast_4_max",
-        "spec_contrast_5_mean",
-        "spec_contrast_5_std",
-        "spec_contrast_5_min",
-        "spec_contrast_5_max",
-        "spec_contrast_6_mean",
-        "spec_contrast_6_std",
-        "spec_contrast_6_min",
-        "spec_contrast_6_max",
-        "spec_contrast_7_mean",
-        "spec_contrast_7_std",
-        "spec_contrast_7_min",
-        "spec_contrast_7_max",
-        "spec_flatness_mean",
-        "spec_flatness_std",
-        "spec_flatness_min",
-        "spec_flatness_max",
-        "spec_rolloff_mean",
-        "spec_rolloff_std",
-        "spec_rolloff_min",
-        "spec_rolloff_max",
-        "mfcc_1_mean",
-        "mfcc_1_std",
-        "mfcc_1_min",
-        "mfcc_1_max",
-        "mfcc_2_mean",
-        "mfcc_2_std",
-        "mfcc_2_min",
-        "mfcc_2_max",
-        "mfcc_3_mean",
-        "mfcc_3_std",
-        "mfcc_3_min",
-        "mfcc_3_max",
-        "mfcc_4_mean",
-        "mfcc_4_std",
-        "mfcc_4_min",
-        "mfcc_4_max",
-        "mfcc_5_mean",
-        "mfcc_5_std",
-        "mfcc_5_min",
-        "mfcc_5_max",
-        "mfcc_6_mean",
-        "mfcc_6_std",
-        "mfcc_6_min",
-        "mfcc_6_max",
-        "mfcc_7_mean",
-        "mfcc_7_std",
-        "mfcc_7_min",
-        "mfcc_7_max",
-        "mfcc_8_mean",
-        "mfcc_8_std",
-        "mfcc_8_min",
-        "mfcc_8_max",
-        "mfcc_9_mean",
-        "mfcc_9_std",
-        "mfcc_9_min",
-        "mfcc_9_max",
-        "mfcc_10_mean",
-        "mfcc_10_std",
-        "mfcc_10_min",
-        "mfcc_10_max",
-        "mfcc_11_mean",
-        "mfcc_11_std",
-        "mfcc_11_min",
-        "mfcc_11_max",
-        "mfcc_12_mean",
-        "mfcc_12_std",
-        "mfcc_12_min",
-        "mfcc_12_max",
-        "mfcc_13_mean",
-        "mfcc_13_std",
-        "mfcc_13_min",
-        "mfcc_13_max",
-        "chromagram_1_mean",
-        "chromagram_1_std",
-        "chromagram_1_min",
-        "chromagram_1_max",
-        "chromagram_2_mean",
-        "chromagram_2_std",
-        "chromagram_2_min",
-        "chromagram_2_max",
-        "chromagram_3_mean",
-        "chromagram_3_std",
-        "chromagram_3_min",
-        "chromagram_3_max",
-        "chromagram_4_mean",
-        "chromagram_4_std",
-        "chromagram_4_min",
-        "chromagram_4_max",
-        "chromagram_5_mean",
-        "chromagram_5_std",
-        "chromagram_5_min",
-        "chromagram_5_max",
-        "chromagram_6_mean",
-        "chromagram_6_std",
-        "chromagram_6_min",
-        "chromagram_6_max",
-        "chromagram_7_mean",
-        "chromagram_7_std",
-        "chromagram_7_min",
-        "chromagram_7_max",
-        "chromagram_8_mean",
-        "chromagram_8_std",
-        "chromagram_8_min",
-        "chromagram_8_max",
-        "chromagram_9_mean",
-        "chromagram_9_std",
-        "chromagram_9_min",
-        "chromagram_9_max",
-        "chromagram_10_mean",
-        "chromagram_10_std",
-        "chromagram_10_min",
-        "chromagram_10_max",
-        "chromagram_11_mean",
-        "chromagram_11_std",
-        "chromagram_11_min",
-        "chromagram_11_max",
-        "chromagram_12_mean",
-        "chromagram_12_std",
-        "chromagram_12_min",
-        "chromagram_12_max",
-    ]
-
-    means = audio_df[audio_cols_to_norm].mean()
-    stds = audio_df[audio_cols_to_norm].std()
-
-    audio_index = audio_df.copy()
-    audio_index = audio_index.drop(audio_cols_to_norm, axis=1)
-
-    audio_df_norm = (audio_df[audio_cols_to_norm] - means) / stds
-
-    audio_df_full = pd.concat([audio_index, audio_df_norm], axis=1)
-
-
-    ### Semantic Normalization ###
-    cols_to_norm = ["valence_tags", "arousal_tags", "dominance_tags"]
-
-    # X' = (X - X_min) / X_max - X_min
-    semantic_df[cols_to_norm] = (
-        semantic_df[cols_to_norm] - semantic_df[cols_to_norm].min()
-    ) / (semantic_df[cols_to_norm].max() - semantic_df[cols_to_norm].min())
-
     normalized_semantic_path = r"server\model\dataset\normalized_semantic.csv"
     normalized_audio_path = r"server\model\dataset\normalized_audio.npy"
 
-    semantic_df.to_csv(normalized_semantic_path)
-
-    audio_array = audio_df_full.to_numpy()
-    np.save(normalized_audio_path, audio_array)
+    # Streamed in chunks: one pass for the running statistics (Welford mean/std for the audio columns,
+    # min/max for the VAD tags), one to write the normalized rows. The statistics are saved next to the
+    # outputs, so new songs can be added later without a full rescan (see normalization.py).
+    normalize_dataset(
+        audio_csv_path, semantic_csv_path, normalized_audio_path, normalized_semantic_path,
+        audio_stats_file=r"server\model\dataset\normalized_audio_stats.json",
+        semantic_stats_file=r"server\model\dataset\normalized_semantic_stats.json",
+    )
 
     print("Data has been normalized!")
 
@@ -256,8 +81,8 @@ Compare each song based on the following traits (priority decreases with order):
 
 audio_data_path = r"server\model\dataset\normalized_audio.npy"
 
-# Load in the auditory data
-audio_tensors = np.load(audio_data_path)
+# Memory-map the auditory data (rows are only read when a batch touches them)
+audio_tensors = open_normalized_audio(audio_data_path)
 
 # print(f"Test: {audio_tensors[0]}") # Works
 
@@ -266,11 +91,14 @@ def split_data(data, n):
         yield data[i : i + n]
 
 
+BATCH_SIZE = 502 # Make batches 502 so we only have 4 songs left over
+
+# Views into the memory map (no rows are read here)
 batches = list(
-    split_data(audio_tensors, 502)
-)  # Make batches 502 so we only have 4 songs left over
+    split_data(audio_tensors, BATCH_SIZE)
+)
 
-print(f"Done: {batches}")
+print(f"Done: {len(batches)} batches of up to {BATCH_SIZE} songs")
 
 from scipy.spatial.distance import jaccard
 
@@ -1008,7 +836,7 @@ genre_classification = {
 genre_to_class = {}
 
 # Invert classes to genres -> genres to class
-for cls, genres in seed_classes.items():
+for cls, genres in genre_classes.items():
     for genre in genres:
         genre_to_class[genre] = cls
 
@@ -1016,17 +844,17 @@ for cls, genres in seed_classes.items():
 def semantic_similarity(song1, song2):
     # Valence
     valence_weight = 0.25
-    valence_distance = jaccard(song1.valence_tag, song2.valence_tag)
+    valence_distance = jaccard([song1.valence_tags], [song2.valence_tags])
     valence_total = valence_weight * valence_distance
 
     # Arousal
     arousal_weight = 0.25
-    arousal_distance = jaccard(song1.arrousal_tag, song2.arousal_tag)
+    arousal_distance = jaccard([song1.arousal_tags], [song2.arousal_tags])
     arousal_total = arousal_weight * arousal_distance
 
     # Dominance
     dominance_weight = 0.25
-    dominance_distance = jaccard(song1.dominance_tag, song2.dominance_tag)
+    dominance_distance = jaccard([song1.dominance_tags], [song2.dominance_tags])
     dominance_total = dominance_weight * dominance_distance
 
     # Seed
@@ -1037,9 +865,9 @@ def semantic_similarity(song1, song2):
     song2_seeds = []
 
     for label in seed_labels:
-        if getattr(song1, label) == 1:
+        if song1[label] == 1:
             song1_seeds.append(label)
-        if getattr(song2, label) == 1:
+        if song2[label] == 1:
             song2_seeds.append(label)
 
     # Check if song2's seed is within song1's seed class:
@@ -1073,9 +901,9 @@ def semantic_similarity(song1, song2):
     song2_genres = []
 
     for label in genre_labels:
-        if getattr(song1, label) == 1:
+        if song1[label] == 1:
             song1_genres.append(label)
-        if getattr(song2, label) == 1:
+        if song2[label] == 1:
             song2_genres.append(label)
     
     # Check if song2's genre is within song1's genre class:
@@ -1105,5 +933,40 @@ def semantic_similarity(song1, song2):
 
     return semantic_similarity
 
+from similarity import SemanticSimilarity
+
+# Every song's VAD tags and seed/genre class bitsets, computed once (see similarity.py)
+semantic_engine = SemanticSimilarity.from_frame(df, seed_labels, seed_to_class, genre_labels, genre_to_class)
+
+# semantic_similarity() of every anchor against every candidate (positions in df), as one matrix
+def semantic_similarity_matrix(anchors=slice(None), candidates=slice(None)):
+    return semantic_engine.block(anchors, candidates)
+
+from tiled_similarity import TiledSimilarity
+
+similarity_path = r"server\model\dataset\similarity"
+
+# Most/least semantically similar candidates of every song, one batch x candidate block tile at a time
+# (bounded memory; an interrupted run resumes from the last finished tile)
+def mine_similarities(k=32):
+    tiled = TiledSimilarity(similarity_path, len(semantic_engine), len(semantic_engine), k=k, anchor_block=BATCH_SIZE)
+
+    tiles = tiled.run(semantic_similarity_matrix, report=lambda done, total: print(f"Tile {done}/{total}", end="\r"))
+    print(f"\nScored {tiles} tiles")
+
+    return tiled
+
+import triplet_mining
+
+triplets_path = r"server\model\dataset\triplets.npy"
+
+# (anchor, positive, negative) song positions of one batch (run mine_similarities() first)
 def triplet_gen(batch_num):
-    return
\ No newline at end of file
+    return triplet_mining.mine_batch(batch_num, audio_data_path, similarity_path, BATCH_SIZE)
+
+# Every batch across `workers` processes (the same triplets for any number of workers)
+def generate_triplets(workers=None, seed=triplet_mining.SEED):
+    triplets = triplet_mining.mine_triplets(triplets_path, workers, audio_data_path, similarity_path, BATCH_SIZE, seed)
+    print(f"Mined {len(triplets)} triplets")
+
+    return triplets
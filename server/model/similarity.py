@@ -0,0 +1,85 @@
+"""
+SIMILARITY:
+
+Batched semantic similarity, the same weighted score as siamese_triplet.semantic_similarity() for a whole
+block of anchors against a block of candidates at once:
+
+    0.25 * valence + 0.25 * arousal + 0.25 * dominance + 0.15 * seed classes + 0.1 * genre classes
+
+    - valence/arousal/dominance:  scipy's jaccard distance of the two tags as one-element vectors; jaccard
+                                  treats them as booleans, so it is 1 when exactly one tag is 0, else 0
+    - seed/genre classes:         |A & B| / max(|A|, |B|, 1) of the sets of classes the two songs' labels
+                                  map to (seed_to_class / genre_to_class)
+
+Everything per song is precomputed once: its VAD tags and the bitsets of its seed and genre classes
+(label_bits.py; the 12 seed classes fit in 2 bytes). A block is then a few broadcast comparisons and
+popcounts instead of getattr over every label column for every pair.
+"""
+
+import numpy as np
+
+import label_bits
+
+WEIGHTS = {"valence": 0.25, "arousal": 0.25, "dominance": 0.25, "seed": 0.15, "genre": 0.1}
+
+vad_columns = ["valence_tags", "arousal_tags", "dominance_tags"]
+
+# (labels, classes) 0/1 matrix: which class each label maps to (labels without a class map to none)
+def class_membership(labels, label_to_class):
+    classes = list(dict.fromkeys(label_to_class.values()))
+    class_index = {cls: i for i, cls in enumerate(classes)}
+
+    membership = np.zeros((len(labels), len(classes)), dtype=np.uint8)
+    for row, label in enumerate(labels):
+        if label in label_to_class:
+            membership[row, class_index[label_to_class[label]]] = 1
+
+    return membership, classes
+
+# Packed (songs, bytes) bitsets of the classes of each song's labels, from (songs, labels) 0/1 flags
+def class_bits(flags, membership):
+    return label_bits.from_flags(np.asarray(flags, dtype=np.float32) @ membership.astype(np.float32) > 0)
+
+# |A & B| / max(|A|, |B|, 1) for every (anchor, candidate) pair
+def pairwise_class_overlap(a, b):
+    shared = label_bits.pairwise_intersection_count(a, b)
+    largest = np.maximum(label_bits.popcount(a)[:, None], label_bits.popcount(b)[None, :])
+    return shared / np.maximum(largest, 1)
+
+class SemanticSimilarity:
+    def __init__(self, vad, seed_classes, genre_classes):
+        self.vad = np.asarray(vad, dtype=np.float64) # (songs, 3)
+        self.seed_classes = seed_classes             # packed (songs, bytes)
+        self.genre_classes = genre_classes
+
+    # From the rows of music_dataset.csv (one 0/1 column per seed and genre label)
+    @classmethod
+    def from_frame(cls, df, seed_labels, seed_to_class, genre_labels, genre_to_class):
+        seed_membership, _ = class_membership(seed_labels, seed_to_class)
+        genre_membership, _ = class_membership(genre_labels, genre_to_class)
+
+        return cls(
+            df[vad_columns].to_numpy(dtype=np.float64),
+            class_bits(df[seed_labels].to_numpy() == 1, seed_membership),
+            class_bits(df[genre_labels].to_numpy() == 1, genre_membership),
+        )
+
+    def __len__(self):
+        return len(self.vad)
+
+    # (len(anchors), len(candidates)) scores; anchors/candidates are song positions (slices or arrays),
+    # all songs by default
+    def block(self, anchors=slice(None), candidates=slice(None)):
+        vad_a, vad_b = self.vad[anchors] != 0, self.vad[candidates] != 0
+
+        score = np.zeros((len(vad_a), len(vad_b)))
+        for column, name in enumerate(("valence", "arousal", "dominance")):
+            score += WEIGHTS[name] * (vad_a[:, None, column] != vad_b[None, :, column])
+
+        score += WEIGHTS["seed"] * pairwise_class_overlap(self.seed_classes[anchors], self.seed_classes[candidates])
+        score += WEIGHTS["genre"] * pairwise_class_overlap(self.genre_classes[anchors], self.genre_classes[candidates])
+
+        return score
+
+    def pair(self, song1, song2):
+        return self.block([song1], [song2])[0, 0]
@@ -0,0 +1,149 @@
+"""
+TILED SIMILARITY:
+
+Out-of-core top-k search over every (anchor, candidate) pair of songs.
+
+The (songs x songs) score matrix is never held in memory: anchors are cut into blocks (the 502-song
+batches of siamese_triplet) and candidates into blocks of CANDIDATE_BLOCK songs, and one anchor block x
+candidate block tile is scored at a time. Only each anchor's running top-k is kept, on disk:
+
+    - top_index.npy / top_scores.npy:        the k most similar candidates of every anchor (best first)
+    - bottom_index.npy / bottom_scores.npy:  the k least similar ones (worst first)
+    - progress.json:                         the tile layout and the tiles that are finished
+
+Empty slots have index -1. Ties are broken by the lower candidate index, so the result does not depend
+on the tile order. After every tile the memory maps are flushed before the tile is marked finished, and
+merging a tile first drops whatever that tile contributed before, so a run that was interrupted resumes
+from the last finished tile and gives the same result as an uninterrupted one.
+"""
+
+import json
+import os
+
+import numpy as np
+
+ANCHOR_BLOCK = 502
+CANDIDATE_BLOCK = 4096
+TOP_K = 32
+
+PROGRESS_FILE = "progress.json"
+RESULT_FILES = ("top_index", "top_scores", "bottom_index", "bottom_scores")
+
+# Keep the k best (index, score) pairs of every row: highest scores first when largest, else lowest;
+# entries of candidates [start, end) are replaced by the tile's, which makes merging a tile idempotent
+def merge_k(index, scores, tile_index, tile_scores, start, end, largest):
+    stale = (index >= start) & (index < end)
+    index = np.where(stale, -1, index)
+
+    all_index = np.concatenate([index, tile_index], axis=1)
+    all_scores = np.concatenate([scores, tile_scores], axis=1)
+
+    # Sort by (empty last, score, candidate index)
+    empty = all_index < 0
+    key = np.where(empty, 0.0, -all_scores if largest else all_scores)
+    order = np.lexsort((all_index, key, empty), axis=-1)[:, :index.shape[1]]
+
+    return np.take_along_axis(all_index, order, axis=1), np.take_along_axis(all_scores, order, axis=1)
+
+class TiledSimilarity:
+    def __init__(self, path, anchors, candidates, k=TOP_K, anchor_block=ANCHOR_BLOCK, candidate_block=CANDIDATE_BLOCK):
+        self.path = path
+        self.layout = {
+            "anchors": anchors,
+            "candidates": candidates,
+            "k": k,
+            "anchor_block": anchor_block,
+            "candidate_block": candidate_block,
+        }
+        self.progress_path = os.path.join(path, PROGRESS_FILE)
+
+        os.makedirs(path, exist_ok=True)
+        progress = self.read_progress()
+
+        # A different layout means different results: start over
+        if progress is None or progress["layout"] != self.layout:
+            self.create()
+            progress = {"layout": self.layout, "done": []}
+            self.write_progress(progress)
+
+        self.done = set(progress["done"])
+        self.results = {
+            name: np.lib.format.open_memmap(self.result_path(name), mode="r+") for name in RESULT_FILES
+        }
+
+    def result_path(self, name):
+        return os.path.join(self.path, f"{name}.npy")
+
+    def read_progress(self):
+        try:
+            with open(self.progress_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def write_progress(self, progress):
+        with open(self.progress_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(progress, f)
+        os.replace(self.progress_path + ".tmp", self.progress_path)
+
+    def create(self):
+        shape = (self.layout["anchors"], self.layout["k"])
+        for name in RESULT_FILES:
+            dtype = np.int32 if name.endswith("index") else np.float32
+            result = np.lib.format.open_memmap(self.result_path(name), mode="w+", dtype=dtype, shape=shape)
+            result[:] = -1 if name.endswith("index") else np.nan
+            result.flush()
+            del result
+
+    # (tile id, anchor range, candidate range) of every tile, anchor block by anchor block
+    def tiles(self):
+        layout = self.layout
+        tile = 0
+        for anchor_start in range(0, layout["anchors"], layout["anchor_block"]):
+            anchor_end = min(anchor_start + layout["anchor_block"], layout["anchors"])
+            for candidate_start in range(0, layout["candidates"], layout["candidate_block"]):
+                candidate_end = min(candidate_start + layout["candidate_block"], layout["candidates"])
+                yield tile, (anchor_start, anchor_end), (candidate_start, candidate_end)
+                tile += 1
+
+    def remaining(self):
+        return [tile for tile in self.tiles() if tile[0] not in self.done]
+
+    # Score one tile with score(anchors, candidates) -> (anchors, candidates) matrix and merge it
+    def run_tile(self, tile, anchor_range, candidate_range, score, exclude_self=True):
+        anchors = slice(*anchor_range)
+        candidates = np.arange(*candidate_range)
+
+        tile_scores = np.asarray(score(anchors, slice(*candidate_range)), dtype=np.float32)
+        tile_index = np.broadcast_to(candidates.astype(np.int32), tile_scores.shape)
+
+        if exclude_self:
+            tile_index = np.where(np.arange(*anchor_range)[:, None] == candidates[None, :], -1, tile_index)
+
+        for prefix, largest in (("top", True), ("bottom", False)):
+            index, scores = self.results[f"{prefix}_index"], self.results[f"{prefix}_scores"]
+            index[anchors], scores[anchors] = merge_k(
+                index[anchors], scores[anchors], tile_index, tile_scores, *candidate_range, largest
+            )
+
+        for result in self.results.values():
+            result.flush()
+
+        self.done.add(tile)
+        self.write_progress({"layout": self.layout, "done": sorted(self.done)})
+
+    # Every tile that is not finished yet; returns how many were run
+    def run(self, score, exclude_self=True, report=None):
+        remaining = self.remaining()
+        for count, (tile, anchor_range, candidate_range) in enumerate(remaining, start=1):
+            self.run_tile(tile, anchor_range, candidate_range, score, exclude_self)
+            if report is not None:
+                report(count, len(remaining))
+        return len(remaining)
+
+    def finished(self):
+        return not self.remaining()
+
+    # (index, scores) of the k most (top) or least (bottom) similar candidates of every anchor
+    def neighbours(self, prefix="top"):
+        return self.results[f"{prefix}_index"], self.results[f"{prefix}_scores"]
@@ -0,0 +1,125 @@
+"""
+TRIPLET MINING:
+
+(anchor, positive, negative) song triplets for the siamese model, mined batch by batch across a pool of
+processes.
+
+For every anchor of a batch (the 502-song batches of siamese_triplet):
+    - positive:  one of its k most semantically similar songs (top_index.npy of the tiled similarity search)
+    - negative:  one of its k least similar songs (bottom_index.npy), semi-hard: the one closest to the
+                 anchor in the normalized audio space that is still farther away than the positive; a
+                 random one when there is none
+
+Workers share the inputs read-only through memory maps of the .npy files (the OS page cache holds one
+copy, whatever the number of workers) and only send their batch's triplets back. Every random choice of a
+batch comes from its own generator, seeded with (seed, batch number), so the triplets are identical for
+any number of workers and any completion order.
+
+`python server/model/triplet_mining.py [--workers N] [--seed S]`
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+normalized_audio_path = r"server/model/dataset/normalized_audio.npy"
+similarity_path = r"server/model/dataset/similarity"
+triplets_path = r"server/model/dataset/triplets.npy"
+
+BATCH_SIZE = 502
+SEED = 0
+
+_open_arrays = {}
+
+# One read-only memory map per file and process
+def open_array(path):
+    if path not in _open_arrays:
+        _open_arrays[path] = np.load(path, mmap_mode="r")
+
+    return _open_arrays[path]
+
+def batch_rng(seed, batch_num):
+    return np.random.default_rng([seed, batch_num])
+
+def batch_count(songs, batch_size=BATCH_SIZE):
+    return (songs + batch_size - 1) // batch_size
+
+# Position of a random valid (index >= 0) entry in every row; -1 for rows without one
+def random_choice(index, rng):
+    valid = index >= 0
+    counts = valid.sum(axis=1)
+
+    # The r-th valid entry of each row, r uniform in [0, count)
+    r = np.floor(rng.random(len(index)) * counts).astype(np.int64)
+    rank = np.cumsum(valid, axis=1) - 1
+    choice = np.argmax(valid & (rank == r[:, None]), axis=1)
+
+    return np.where(counts > 0, choice, -1)
+
+def take(index, choice):
+    return np.where(choice >= 0, np.take_along_axis(index, np.maximum(choice, 0)[:, None], axis=1)[:, 0], -1)
+
+# (anchors, 3) int32 triplets of one batch; anchors without a positive or a negative are left out
+def mine_batch(batch_num, audio_path=normalized_audio_path, neighbours_path=similarity_path,
+               batch_size=BATCH_SIZE, seed=SEED):
+    audio = open_array(audio_path)
+    top_index = open_array(os.path.join(neighbours_path, "top_index.npy"))
+    bottom_index = open_array(os.path.join(neighbours_path, "bottom_index.npy"))
+
+    anchors = np.arange(batch_num * batch_size, min((batch_num + 1) * batch_size, len(top_index)))
+    rng = batch_rng(seed, batch_num)
+
+    positives = take(top_index[anchors], random_choice(top_index[anchors], rng))
+
+    # Audio distances of the anchors to their positive and to every negative candidate (column 0 is the index)
+    negatives = np.asarray(bottom_index[anchors])
+    features = audio[:, 1:]
+    anchor_features = np.asarray(features[anchors], dtype=np.float64)
+
+    positive_distance = np.linalg.norm(np.asarray(features[np.maximum(positives, 0)]) - anchor_features, axis=1)
+    negative_features = np.asarray(features[np.maximum(negatives, 0).ravel()], dtype=np.float64)
+    negative_distance = np.linalg.norm(
+        negative_features.reshape(negatives.shape + (-1,)) - anchor_features[:, None, :], axis=2
+    )
+
+    # Semi-hard: the closest negative that is still farther than the positive
+    semi_hard = (negatives >= 0) & (negative_distance > positive_distance[:, None])
+    closest = np.argmin(np.where(semi_hard, negative_distance, np.inf), axis=1)
+    fallback = random_choice(negatives, rng)
+    negatives = take(negatives, np.where(semi_hard.any(axis=1), closest, fallback))
+
+    triplets = np.stack([anchors, positives, negatives], axis=1).astype(np.int32)
+    return triplets[(positives >= 0) & (negatives >= 0)]
+
+# Mine every batch on `workers` processes; the triplets are written in batch order
+def mine_triplets(out_path=triplets_path, workers=None, audio_path=normalized_audio_path,
+                  neighbours_path=similarity_path, batch_size=BATCH_SIZE, seed=SEED):
+    songs = len(open_array(os.path.join(neighbours_path, "top_index.npy")))
+    batches = range(batch_count(songs, batch_size))
+    args = (audio_path, neighbours_path, batch_size, seed)
+
+    if workers == 1:
+        results = [mine_batch(batch_num, *args) for batch_num in batches]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(mine_batch, batch_num, *args) for batch_num in batches]
+            results = [future.result() for future in futures]
+
+    triplets = np.concatenate(results) if results else np.zeros((0, 3), dtype=np.int32)
+    np.save(out_path, triplets)
+
+    return triplets
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=None, help="Defaults to the number of cores")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--output", default=triplets_path)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    triplets = mine_triplets(args.output, args.workers, seed=args.seed)
+    print(f"Mined {len(triplets)} triplets into {args.output} in {time.perf_counter() - start:.2f}s")
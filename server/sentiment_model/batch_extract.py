@@ -0,0 +1,170 @@
+'''
+BATCH FEATURE EXTRACTION:
+
+Runs the analyze_audio feature logic over local audio files instead of a live 15 second recording,
+fanning the clips out over a process pool (one worker per core by default).
+
+Input is either
+    - a directory of audio files named `<spotify_id>.<ext>` (wav, flac, mp3, ogg, m4a),
+    - a manifest (.json array or .csv) with `spotify_id` and `path` columns, or
+    - a clip archive of recorded clips (see clip_archive.py); these are already the recorded window, so
+      --offset/--duration do not apply, and the clips are handed out in storage order
+
+`python server/sentiment_model/batch_extract.py server/sentiment_model/clips --output batch_features.jsonl`
+
+Results are appended to a record log (see record_log.py), one object per clip keyed by spotify_id. Ids
+already present in the log are skipped, so an interrupted run can simply be started again.
+
+With `--matrix features.npy` the same features are also written as a float32 matrix (one row per clip,
+columns as feature_engine.feature_columns) with the row order saved next to it in `features_ids.json`.
+
+`--profile fast|timbre-only` only extracts the feature blocks of that profile (see feature_engine.py);
+the matrix columns of the other blocks are NaN.
+
+With `--cache` the feature summaries are looked up in (and added to) the feature cache (see feature_cache.py):
+re-extracting the same clips into a new output, e.g. after one feature changed, only recomputes what changed.
+'''
+
+import argparse
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import librosa as lib
+import numpy as np
+
+from feature_engine import compute_features, features_to_json, feature_row, feature_columns, extraction_profiles
+from clip_archive import is_clip_archive, open_clip_archive
+from feature_cache import cache_path, open_feature_cache, cached_summaries
+from record_log import append_record, read_records, recover_log
+
+AUDIO_EXTENSIONS = (".wav", ".flac", ".mp3", ".ogg", ".m4a")
+
+# Same window of the song that the crawler records (WebPlayback.tsx starts playback at 45s)
+CLIP_OFFSET = 45.0
+RECORD_SECONDS = 15
+
+output_path = r"server/sentiment_model/batch_features.jsonl"
+
+# Collect (spotify_id, path) pairs from a directory or a manifest file
+def read_jobs(source):
+    if is_clip_archive(source):
+        return [(spotify_id, source) for spotify_id in open_clip_archive(source).ids()]
+
+    if os.path.isdir(source):
+        jobs = []
+        for file_name in sorted(os.listdir(source)):
+            spotify_id, extension = os.path.splitext(file_name)
+            if extension.lower() in AUDIO_EXTENSIONS:
+                jobs.append((spotify_id, os.path.join(source, file_name)))
+        return jobs
+
+    with open(source, mode="r", encoding="utf-8") as f:
+        if source.lower().endswith(".csv"):
+            rows = list(csv.DictReader(f))
+        else:
+            rows = json.load(f)
+
+    # Relative manifest paths are relative to the manifest itself
+    base_dir = os.path.dirname(os.path.abspath(source))
+    return [(row["spotify_id"], os.path.join(base_dir, row["path"])) for row in rows]
+
+# Worker: decode one clip and run the feature engine on it
+def featurize(spotify_id, audio_path, offset, duration, with_row=False, feature_cache_path=None, profile="full"):
+    if is_clip_archive(audio_path):
+        y, sr = open_clip_archive(audio_path).audio(spotify_id)
+    else:
+        y, sr = lib.load(audio_path, offset=offset, duration=duration)
+
+    if feature_cache_path is not None:
+        features = summaries = cached_summaries(y, sr, open_feature_cache(feature_cache_path), profile)
+    else:
+        summaries = None
+        features = compute_features(y, sr, profile=profile)
+
+    record = {"spotify_id": spotify_id}
+    record.update(features_to_json(features, summaries))
+
+    return record, feature_row(features, summaries) if with_row else None
+
+# Rows for clips extracted by an earlier run come from their log records
+def record_to_row(record, out):
+    out[:] = [record.get(column, np.nan) for column in feature_columns] # NaN: not in the profile
+
+def save_matrix(matrix_path, matrix, spotify_ids):
+    np.save(matrix_path, matrix)
+
+    ids_path = os.path.splitext(matrix_path)[0] + "_ids.json"
+    with open(ids_path, mode="w", encoding="utf-8") as f:
+        json.dump(spotify_ids, f)
+
+    print(f"Saved {matrix.shape[0]} x {matrix.shape[1]} feature matrix to {matrix_path}")
+
+def run_batch(jobs, output_path, workers=None, offset=CLIP_OFFSET, duration=RECORD_SECONDS, matrix_path=None, report_every=500, feature_cache_path=None, profile="full"):
+    recover_log(output_path)
+    extracted = {record["spotify_id"]: record for record in read_records(output_path)}
+    pending = [(spotify_id, path) for spotify_id, path in jobs if spotify_id not in extracted]
+
+    # Preallocated float32 matrix, one row per job (NaN until the clip is extracted)
+    spotify_ids = [spotify_id for spotify_id, _ in jobs]
+    rows = {spotify_id: i for i, spotify_id in enumerate(spotify_ids)}
+    matrix = None
+
+    if matrix_path is not None:
+        matrix = np.full((len(jobs), len(feature_columns)), np.nan, dtype=np.float32)
+        for spotify_id, record in extracted.items():
+            if spotify_id in rows:
+                record_to_row(record, matrix[rows[spotify_id]])
+
+    print(f"{len(jobs)} clips, {len(jobs) - len(pending)} already extracted, {len(pending)} to go")
+
+    failures = {}
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(featurize, spotify_id, path, offset, duration, matrix is not None, feature_cache_path, profile): spotify_id
+            for spotify_id, path in pending
+        }
+
+        for done, future in enumerate(as_completed(futures), start=1):
+            spotify_id = futures[future]
+            try:
+                record, row = future.result()
+                append_record(output_path, record)
+
+                if matrix is not None:
+                    matrix[rows[spotify_id]] = row
+            except Exception as e:
+                failures[spotify_id] = str(e)
+                print(f"Error extracting {spotify_id}: {e}")
+
+            if done % report_every == 0:
+                rate = done / (time.perf_counter() - start)
+                print(f"Progress: {done} / {len(pending)} ({rate:.1f} clips/s)")
+
+    if matrix is not None:
+        save_matrix(matrix_path, matrix, spotify_ids)
+
+    print(f"Done! {len(pending) - len(failures)} extracted, {len(failures)} failed")
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("source", help="Directory of <spotify_id>.<ext> files or a .json/.csv manifest")
+    parser.add_argument("--output", default=output_path)
+    parser.add_argument("--workers", type=int, default=None, help="Defaults to the number of cores")
+    parser.add_argument("--offset", type=float, default=CLIP_OFFSET)
+    parser.add_argument("--duration", type=float, default=RECORD_SECONDS)
+    parser.add_argument("--matrix", default=None, help="Also save the features as a float32 .npy matrix")
+    parser.add_argument("--cache", nargs="?", const=cache_path, default=None, help="Use the feature cache (optionally at this path)")
+    parser.add_argument("--profile", default="full", choices=list(extraction_profiles), help="Feature blocks to extract")
+    args = parser.parse_args()
+
+    jobs = read_jobs(args.source)
+    run_batch(jobs, args.output, workers=args.workers, offset=args.offset, duration=args.duration, matrix_path=args.matrix, feature_cache_path=args.cache, profile=args.profile)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+'''
+BENCHMARK:
+
+Compares the per-clip CPU time of the old extraction (one librosa call per feature, each computing its
+own STFT/mel spectrogram from `y`) against the shared-STFT feature engine, and the old rhythm features
+(onset_strength + tempo + a full beat_track from `y`) against the single-pass rhythm stages (rhythm.py).
+The engine's wall time per stage is printed as well.
+
+`python server/sentiment_model/benchmark_features.py [path/to/clip.wav] [--repeats N]`
+
+Without a clip, a synthetic 15 second signal (same length as a recorded crawl clip) is used.
+'''
+
+import argparse
+import time
+
+import librosa as lib
+import numpy as np
+
+from feature_engine import assign_summary, compute_features, extract_features, summary_prefixes
+
+RECORD_SECONDS = 15
+SAMPLE_RATE = 22050
+
+# The extraction as analyze_audio used to do it (kept here only as the baseline)
+def legacy_extract_features(y, sr):
+    onset_env = lib.onset.onset_strength(y=y, sr=sr)
+    tempo = lib.feature.tempo(onset_envelope=onset_env, sr=sr)
+
+    features = {
+        "rms": lib.feature.rms(y=y),
+        "zcr": lib.feature.zero_crossing_rate(y=y),
+        "spec_centroid": lib.feature.spectral_centroid(y=y, sr=sr),
+        "spec_bandwidth": lib.feature.spectral_bandwidth(y=y, sr=sr),
+        "spec_contrast": lib.feature.spectral_contrast(y=y, sr=sr),
+        "spec_flatness": lib.feature.spectral_flatness(y=y),
+        "spec_rolloff": lib.feature.spectral_rolloff(y=y, sr=sr),
+        "mfcc": lib.feature.mfcc(y=y, sr=sr, n_mfcc=13),
+        "chromagram": lib.feature.chroma_stft(y=y, sr=sr),
+    }
+    tempo_bt, _ = lib.beat.beat_track(y=y, sr=sr, units='time')
+
+    json_object = {}
+    json_object["tempo"] = float(tempo[0])
+    json_object["tempo_bt"] = float(np.atleast_1d(tempo_bt)[0])
+
+    for prefix in summary_prefixes:
+        assign_summary(json_object, features[prefix], prefix)
+
+    return json_object
+
+# tempo and tempo_bt as analyze_audio used to compute them (two onset passes + the beat tracker)
+def legacy_rhythm(y, sr):
+    tempo = lib.feature.tempo(onset_envelope=lib.onset.onset_strength(y=y, sr=sr), sr=sr)
+    tempo_bt, _ = lib.beat.beat_track(y=y, sr=sr, units='time')
+
+    return {"tempo": float(tempo[0]), "tempo_bt": float(np.atleast_1d(tempo_bt)[0])}
+
+def rhythm_only(y, sr):
+    features = compute_features(y, sr, skip=summary_prefixes)
+    return {name: float(np.atleast_1d(value)[0]) for name, value in features.items()}
+
+# Average wall time per engine stage, slowest first
+def stage_times(y, sr, repeats):
+    totals = {}
+    for _ in range(repeats):
+        timings = {}
+        compute_features(y, sr, timings=timings)
+        for stage, seconds in timings.items():
+            totals[stage] = totals.get(stage, 0.0) + seconds / repeats
+
+    return sorted(totals.items(), key=lambda item: -item[1])
+
+# Clicks on a 120 bpm grid over a few harmonics so that every feature has something to measure
+def synthetic_clip(seconds=RECORD_SECONDS, sr=SAMPLE_RATE):
+    t = np.arange(seconds * sr) / sr
+    y = 0.3 * np.sin(2 * np.pi * 220 * t) + 0.2 * np.sin(2 * np.pi * 330 * t)
+    y += lib.clicks(times=np.arange(0, seconds, 0.5), sr=sr, length=len(t))
+    y += 0.01 * np.random.default_rng(0).standard_normal(len(t))
+
+    return y.astype(np.float32)
+
+def time_per_clip(extract, y, sr, repeats):
+    extract(y, sr) # Warm-up (filter banks and FFT plans are cached after the first call)
+
+    start = time.process_time()
+    for _ in range(repeats):
+        result = extract(y, sr)
+    elapsed = (time.process_time() - start) / repeats
+
+    return elapsed, result
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("clip", nargs="?", help="Audio file to benchmark on (defaults to a synthetic clip)")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.clip:
+        y, sr = lib.load(args.clip)
+    else:
+        y, sr = synthetic_clip(), SAMPLE_RATE
+
+    legacy_time, legacy_features = time_per_clip(legacy_extract_features, y, sr, args.repeats)
+    shared_time, shared_features = time_per_clip(extract_features, y, sr, args.repeats)
+
+    max_diff = max(abs(legacy_features[key] - shared_features[key]) for key in legacy_features)
+
+    print(f"Clip length: {len(y) / sr:.1f}s, {args.repeats} repeats")
+    print(f"Per-feature librosa calls: {legacy_time * 1000:.1f} ms CPU per clip")
+    print(f"Shared STFT feature engine: {shared_time * 1000:.1f} ms CPU per clip")
+    print(f"Speedup: {legacy_time / shared_time:.2f}x")
+    print(f"Same keys: {list(legacy_features) == list(shared_features)}, max abs difference: {max_diff:.3g}")
+
+    legacy_rhythm_time, legacy_tempos = time_per_clip(legacy_rhythm, y, sr, args.repeats)
+    rhythm_time, tempos = time_per_clip(rhythm_only, y, sr, args.repeats)
+
+    print(f"Rhythm, onset_strength + beat_track from y: {legacy_rhythm_time * 1000:.1f} ms CPU per clip")
+    print(f"Rhythm, single onset pass (incl. STFT/mel): {rhythm_time * 1000:.1f} ms CPU per clip")
+    print(f"Same tempos: {legacy_tempos == tempos} ({tempos['tempo']:.1f} / {tempos['tempo_bt']:.1f} bpm)")
+
+    print("Wall time per stage:")
+    for stage, seconds in stage_times(y, sr, args.repeats):
+        print(f"    {stage:16s} {seconds * 1000:7.2f} ms")
+
+if __name__ == "__main__":
+    main()
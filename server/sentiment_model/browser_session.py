@@ -0,0 +1,229 @@
+'''
+BROWSER SESSION:
+
+One long-lived Chrome window on the web player for the whole crawl, instead of a new webdriver.Chrome
+(and a fresh React app + Spotify SDK load) for every song.
+
+The player is moved to the next track through its own index: write_index() updates current_index.json,
+the filewatcher pushes it over the WebSocket and WebPlayback.tsx starts that track. If the session dies
+(Chrome crashed, window closed, page stuck) it is restarted and the player is pointed at the current
+track again.
+
+There are no fixed sleeps: every step waits on a player state change in the DOM (WebPlayback.tsx)
+    - playing:        the #target button reads "PAUSE"
+    - track changed:  #target-track-name differs from the previously recorded track
+    - index advanced: #current-index shows the index that was just written
+'''
+
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+LINK_TO_CRAWL = "http://localhost:5173/"
+WAIT_SECONDS = 20
+MAX_RESTARTS = 3 # Per song, before giving up on it
+MAX_RETRIES = 5 # Other errors per song (they used to be retried forever)
+PLAY_WAIT_SECONDS = 3 # How long a click (or the player's own autoplay) gets to start playback
+TRACK_CHANGE_SECONDS = 5 # Consecutive tracks can share a name, so this one falls through after a while
+
+PLAY_BUTTON = (By.XPATH, "//button[@id='target']")
+TRACK_NAME = (By.XPATH, "//div[@id='target-track-name']")
+CURRENT_INDEX = (By.XPATH, "//div[@id='current-index']")
+
+# ----------------------------------------- PLAYER STATES -----------------------------------------
+
+def element_text(driver, locator):
+    return driver.find_element(*locator).text.strip()
+
+# Playing once the toggle button offers to pause
+def is_playing(driver):
+    return element_text(driver, PLAY_BUTTON).lower() == "pause"
+
+def player_state_known(driver):
+    return element_text(driver, PLAY_BUTTON).lower() in ("play", "pause")
+
+def track_changed(previous_name):
+    return lambda driver: element_text(driver, TRACK_NAME) not in ("", previous_name)
+
+def index_advanced(expected_index):
+    return lambda driver: element_text(driver, CURRENT_INDEX) == str(expected_index)
+
+# ---------------------------------------------------------------------------------------------------
+
+class BrowserSession:
+    def __init__(self, options, write_index, link=LINK_TO_CRAWL):
+        self.options = options
+        self.write_index = write_index # Moves the web player to a track (webcrawl.write_index)
+        self.link = link
+        self.driver = None
+        self.wait = None
+        self.restarts = 0
+        self.previous_name = None # Name of the last recorded track
+
+    def start(self, index):
+        self.driver = webdriver.Chrome(options=self.options)
+        self.wait = WebDriverWait(self.driver, WAIT_SECONDS)
+        self.driver.get(self.link)
+
+        self.wait.until(
+            EC.presence_of_element_located(PLAY_BUTTON)
+        )
+
+        # A fresh page has not received an index over the WebSocket yet; send the current one again
+        self.write_index(index, 1)
+
+        self.wait.until(
+            EC.visibility_of_all_elements_located((By.TAG_NAME, "img"))
+        )
+
+        print("Browser session started.")
+
+    def close(self):
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except WebDriverException:
+                pass
+        self.driver = None
+
+    def restart(self, index):
+        self.restarts += 1
+        print(f"Restarting browser session (restart {self.restarts})...")
+        self.close()
+        self.start(index)
+
+    # A session is stale when Chrome is gone or the player page no longer responds
+    def is_alive(self):
+        if self.driver is None:
+            return False
+        try:
+            self.driver.find_element(*PLAY_BUTTON)
+            return True
+        except WebDriverException:
+            return False
+
+    def ensure(self, index):
+        if self.driver is None:
+            self.start(index)
+        elif not self.is_alive():
+            self.restart(index)
+
+    def wait_for(self, condition, seconds):
+        try:
+            WebDriverWait(self.driver, seconds).until(condition)
+            return True
+        except TimeoutException:
+            return False
+
+    # Wait for the player to switch away from the last recorded track
+    def track_name(self):
+        self.wait.until(
+            EC.presence_of_element_located(TRACK_NAME)
+        )
+
+        if self.previous_name is not None and not self.wait_for(track_changed(self.previous_name), TRACK_CHANGE_SECONDS):
+            print(f"Track name did not change from {self.previous_name}")
+
+        return element_text(self.driver, TRACK_NAME)
+
+    # Wait for playback to start (the player autoplays new tracks) and click play only if it does not
+    def ensure_playing(self):
+        elem = self.wait.until(
+            EC.element_to_be_clickable(PLAY_BUTTON)
+        )
+        self.wait.until(player_state_known)
+
+        i = 0
+        while not self.wait_for(is_playing, PLAY_WAIT_SECONDS):
+            if i >= 2:
+                print("Too many attempts. Something is wrong with the while loop.")
+
+                print("Resetting...")
+                i = 0
+                self.driver.refresh()
+                elem = self.wait.until(
+                    EC.element_to_be_clickable(PLAY_BUTTON)
+                )
+                self.wait.until(player_state_known)
+
+                if is_playing(self.driver):
+                    break
+
+            elem.click()
+            i += 1
+
+        print("Successfully clicked!")
+        return elem
+
+    # Play track `index`, run `record` while it plays, then advance the player to index + 1 (unless
+    # `advance` is False: the last track has no next one)
+    def play_track(self, index, record, advance=True):
+        track_name, audio = self.capture(index, record)
+        self.previous_name = track_name
+
+        if not advance:
+            return index, track_name, audio
+
+        return self.advance(index), track_name, audio
+
+    # Record track `index`, restarting the session or retrying on errors until a capture succeeds
+    def capture(self, index, record):
+        attempts = 0
+        retries = 0
+
+        while True:
+            try:
+                self.ensure(index)
+
+                track_name = self.track_name()
+                print(f"Name: {track_name}")
+
+                self.ensure_playing()
+
+                audio = record()
+
+                # If by THIS point, the audio is still not working, the recording is no good: retried here,
+                # then failed through the work queue like any other error (sys.exit() ended the whole run)
+                if not is_playing(self.driver):
+                    raise RuntimeError("Audio was not playing")
+
+                return track_name, audio
+            except WebDriverException as e:
+                # Dead or wedged session: start a new one on the same track
+                attempts += 1
+                if attempts > MAX_RESTARTS:
+                    raise
+                print("Browser session error: ", e)
+                self.restart(index)
+            except Exception as e:
+                retries += 1
+                if retries > MAX_RETRIES:
+                    raise
+                print("Retrying: ", e)
+
+    # Move the player to index + 1 once track `index` is captured; returns the index the player reports
+    # for the recorded track. Not retried: the capture is kept whatever happens here.
+    def advance(self, index):
+        # Update the index in here -- the player starts the next track in this same window
+        self.write_index(index + 1, 1)
+        print(f"Song {index}: Updated index to {index + 1}")
+
+        try:
+            # The player shows the new index minus one, i.e. the song that was just recorded
+            if not self.wait_for(index_advanced(index), WAIT_SECONDS):
+                print(f"Index did not advance past {index}")
+
+            updated_index = element_text(self.driver, CURRENT_INDEX)
+        except WebDriverException as e:
+            # The next ensure() restarts the session on index + 1
+            print("Browser session error after recording: ", e)
+            return index
+
+        print(f"[UPDATE] {updated_index}")
+
+        react_index = int(updated_index)
+        print(f"[WebPlayback.tsx] current_index: {react_index}")
+
+        return react_index
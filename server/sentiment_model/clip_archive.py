@@ -0,0 +1,184 @@
+'''
+CLIP ARCHIVE:
+
+Keeps the raw audio of every recorded clip, so that a new or changed feature can be computed from the
+archive instead of crawling the whole dataset live again.
+
+An archive is a directory with
+    - clips.i16:    the captured int16 frames of every clip, back to back, exactly as PyAudio delivered them
+    - index.jsonl:  one record per clip (spotify_id, byte offset, frames, channels, rate), see record_log.py
+
+Clips are appended: the frames are fsynced before their index record is written, so a crash leaves at most
+some unindexed bytes at the end of clips.i16, which the next writable open cuts off. The latest clip of a
+spotify_id wins when a song was recorded again. Appends hold an exclusive lock on clips.i16 (where fcntl
+exists), so the lanes of multi_lane_crawl.py can share one archive.
+
+Reading goes through a memory map of clips.i16, so a clip is a zero-copy view and batch jobs that walk
+the archive in offset order (iter_clips) read it sequentially at disk speed. Raw int16 keeps the frames
+bit-exact (a 15s stereo clip at 44.1 kHz is ~2.6 MB).
+
+`python server/sentiment_model/clip_archive.py server/sentiment_model/clip_archive` lists the archive;
+`... clip_archive <spotify_id> out.wav` writes one clip back out as a WAV file.
+'''
+
+import os
+import sys
+import wave
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError: # Windows: a single crawler per archive
+    fcntl = None
+
+from feature_engine import SAMPLE_RATE, pcm_to_audio
+from record_log import append_record, read_records, recover_log
+
+clip_archive_path = r"server/sentiment_model/clip_archive"
+
+DATA_FILE = "clips.i16"
+INDEX_FILE = "index.jsonl"
+SAMPLE_BYTES = 2 # int16
+
+def is_clip_archive(path):
+    return os.path.isfile(os.path.join(path, INDEX_FILE))
+
+def clip_end(record):
+    return record["offset"] + record["frames"] * record["channels"] * SAMPLE_BYTES
+
+# Readers (writable=False) never modify the files, so they can run while the crawler is appending
+class ClipArchive:
+    def __init__(self, path=clip_archive_path, writable=False):
+        self.path = path
+        self.writable = writable
+        self.data_path = os.path.join(path, DATA_FILE)
+        self.index_path = os.path.join(path, INDEX_FILE)
+
+        self.data = None
+
+        if not writable:
+            self.load_index()
+            return
+
+        # Drop frames whose index record never made it to disk (under the lock: other lanes may be appending)
+        os.makedirs(path, exist_ok=True)
+        with open(self.data_path, mode="ab") as f:
+            self.lock(f)
+            recover_log(self.index_path)
+            self.load_index()
+
+            if f.seek(0, os.SEEK_END) > self.end:
+                f.truncate(self.end)
+
+    def load_index(self):
+        self.clips = {}
+        try:
+            for record in read_records(self.index_path):
+                self.clips[record["spotify_id"]] = record
+        except ValueError:
+            pass # A reader can see the record that is being appended right now
+
+        self.end = max(map(clip_end, self.clips.values()), default=0)
+
+    def __len__(self):
+        return len(self.clips)
+
+    def __contains__(self, spotify_id):
+        return spotify_id in self.clips
+
+    # Clip ids in the order their frames are stored
+    def ids(self):
+        return sorted(self.clips, key=lambda spotify_id: self.clips[spotify_id]["offset"])
+
+    # Held until the file is closed
+    def lock(self, f):
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+    def add(self, spotify_id, pcm, channels, rate):
+        if isinstance(pcm, (list, tuple)):
+            pcm = b"".join(pcm)
+        pcm = memoryview(pcm).cast("B")
+
+        # The offset and the index record are taken under the lock, so concurrent writers cannot interleave
+        with open(self.data_path, mode="ab") as f:
+            self.lock(f)
+            offset = f.seek(0, os.SEEK_END)
+            f.write(pcm)
+            f.flush()
+            os.fsync(f.fileno())
+
+            record = {
+                "spotify_id": spotify_id,
+                "offset": offset,
+                "frames": len(pcm) // (channels * SAMPLE_BYTES),
+                "channels": channels,
+                "rate": rate,
+            }
+            append_record(self.index_path, record)
+
+        self.clips[spotify_id] = record
+        self.end = offset + len(pcm)
+
+    # Memory map of the data file, remapped when clips were added after it was mapped
+    def mapped(self):
+        if self.data is None or len(self.data) < self.end // SAMPLE_BYTES:
+            self.data = np.memmap(self.data_path, dtype=np.int16, mode="r") if self.end else np.zeros(0, np.int16)
+        return self.data
+
+    # Interleaved int16 frames (a view into the memory map) + the format they were captured in
+    def pcm(self, spotify_id):
+        record = self.clips[spotify_id]
+        start = record["offset"] // SAMPLE_BYTES
+        samples = record["frames"] * record["channels"]
+
+        return self.mapped()[start:start + samples], record["channels"], record["rate"]
+
+    # Same `y, sr` as the crawler analyzes (see feature_engine.pcm_to_audio)
+    def audio(self, spotify_id, sr=SAMPLE_RATE):
+        pcm, channels, rate = self.pcm(spotify_id)
+        return pcm_to_audio(pcm, channels, rate, sr)
+
+    # Walk clips in storage order, so the reads are sequential
+    def iter_clips(self, spotify_ids=None):
+        wanted = None if spotify_ids is None else set(spotify_ids)
+        for spotify_id in self.ids():
+            if wanted is None or spotify_id in wanted:
+                yield (spotify_id,) + self.pcm(spotify_id)
+
+    def write_wav(self, spotify_id, wav_path):
+        pcm, channels, rate = self.pcm(spotify_id)
+
+        with wave.open(wav_path, "wb") as wf:
+            wf.setnchannels(channels)
+            wf.setsampwidth(SAMPLE_BYTES)
+            wf.setframerate(rate)
+            wf.writeframes(pcm.tobytes())
+
+_open_archives = {}
+
+# One archive (and memory map) per path and process, e.g. per batch_extract worker
+def open_clip_archive(path=clip_archive_path):
+    if path not in _open_archives:
+        _open_archives[path] = ClipArchive(path)
+
+    return _open_archives[path]
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 4):
+        print("Usage: clip_archive.py <archive> [<spotify_id> <out.wav>]")
+        sys.exit(1)
+
+    if not is_clip_archive(sys.argv[1]):
+        print(f"{sys.argv[1]} is not a clip archive")
+        sys.exit(1)
+
+    archive = ClipArchive(sys.argv[1])
+
+    if len(sys.argv) == 4:
+        archive.write_wav(sys.argv[2], sys.argv[3])
+        print(f"Wrote {sys.argv[2]} to {sys.argv[3]}")
+    else:
+        seconds = sum(record["frames"] / record["rate"] for record in archive.clips.values())
+        print(f"{len(archive)} clips, {seconds / 3600:.1f} hours, {archive.end / 1024**3:.2f} GB")
@@ -0,0 +1,191 @@
+'''
+PIPELINED CRAWLER:
+
+webcrawl.main() runs every song strictly in sequence (browser -> record -> librosa -> write). Here the
+stages run concurrently and are connected by bounded queues:
+
+    producer --(indices)--> capture --(clips)--> analysis pool --(features, in order)--> writer
+
+    1. producer: hands out the next track indices
+    2. capture:  drives the web player and records the clip (one thread; it owns the audio device)
+    3. analysis: feature extraction on a process pool, so librosa for song N runs while N+1 is recorded
+    4. writer:   appends the results in index order, checks the track names and archives the clips
+                 (as process_song does)
+
+Throughput is bounded by the capture stage (the 15 second recording) instead of the sum of all stages.
+The queues are bounded so that a slow stage applies back-pressure instead of piling clips up in memory.
+
+Same run instructions as webcrawl.py, then:
+`python server/sentiment_model/crawl_pipeline.py`
+'''
+
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from feature_engine import extract_pcm_features
+
+QUEUE_SIZE = 2 # Clips waiting between two stages
+ANALYSIS_WORKERS = max(1, (os.cpu_count() or 2) - 1) # Leave a core for the browser and the recorder
+
+# The pool's workers start on the first submit(), while the capture/writer threads and Selenium are running;
+# forking a process with live threads can leave their locks held in the child, so workers come from a
+# forkserver instead (a clean process that only imports this module)
+MP_CONTEXT = "forkserver"
+
+# Blocking put/get that give up once another stage has failed
+def put(q, item, stop):
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.5)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+def get(q, stop):
+    while not stop.is_set():
+        try:
+            return q.get(timeout=0.5)
+        except queue.Empty:
+            pass
+    return None
+
+class CrawlPipeline:
+    def __init__(self, crawler, start_index, end_index, workers=ANALYSIS_WORKERS):
+        self.crawler = crawler # The webcrawl module (browser, recorder, output files)
+        self.start_index = start_index
+        self.end_index = end_index
+        self.workers = workers
+
+        self.indices = queue.Queue(maxsize=QUEUE_SIZE)
+        self.clips = queue.Queue(maxsize=QUEUE_SIZE)
+        self.results = queue.Queue(maxsize=QUEUE_SIZE + workers)
+
+        self.stop = threading.Event()
+        self.error = None
+        self.next_to_write = start_index # First index whose result is not on disk yet
+
+    def fail(self, stage, e):
+        if self.error is None:
+            self.error = e
+            print(f"[{stage}] Error: {e}")
+        self.stop.set()
+
+    def producer(self):
+        for index in range(self.start_index, self.end_index):
+            if not put(self.indices, index, self.stop):
+                return
+        put(self.indices, None, self.stop)
+
+    def capture(self):
+        try:
+            while True:
+                index = get(self.indices, self.stop)
+                if index is None:
+                    break
+
+                print(f"\n=== Recording song {index}/{self.end_index} ===")
+                react_index, track_name, pcm = self.crawler.open_selenium(index, record=self.crawler.capture_pcm)
+
+                if not put(self.clips, (index, react_index, track_name, pcm), self.stop):
+                    return
+        except BaseException as e:
+            self.fail("capture", e)
+        finally:
+            put(self.clips, None, self.stop)
+
+    # Futures are queued in submission order, so the writer sees results in index order
+    def analysis(self, executor):
+        try:
+            while True:
+                clip = get(self.clips, self.stop)
+                if clip is None:
+                    break
+
+                index, react_index, track_name, pcm = clip
+                future = executor.submit(
+                    extract_pcm_features, pcm, self.crawler.CHANNELS, self.crawler.RATE, self.crawler.EXTRACTION_PROFILE
+                )
+
+                if not put(self.results, (index, react_index, track_name, future, pcm), self.stop):
+                    return
+        except BaseException as e:
+            self.fail("analysis", e)
+        finally:
+            put(self.results, None, self.stop)
+
+    def writer(self):
+        crawler = self.crawler
+
+        try:
+            while True:
+                result = get(self.results, self.stop)
+                if result is None:
+                    break
+
+                index, react_index, input_name, future, pcm = result
+                audio_features = future.result()
+
+                input_id = crawler.muse_index[react_index]["spotify_id"]
+                json_object = crawler.analyze_audio(audio_features, crawler.muse_index, index)
+                output_id, output_name = json_object["spotify_id"], json_object["track"]
+                print(f"Song {index}: Audio analyzed")
+
+                self.next_to_write = index + 1
+
+                # Raises (after the failure email) if the player was on a different track, before anything
+                # is recorded for it
+                crawler.track_name_comparison(input_name=input_name, input_id=input_id, output_name=output_name, output_id=output_id)
+
+                crawler.save_record(json_object, crawler.output_log_path)
+                crawler.archive_clip(output_id, pcm)
+        except BaseException as e:
+            self.fail("writer", e)
+
+    def run(self):
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context(MP_CONTEXT)) as executor:
+            threads = [
+                threading.Thread(target=self.producer, daemon=True),
+                threading.Thread(target=self.capture, daemon=True),
+                threading.Thread(target=self.analysis, args=(executor,), daemon=True),
+                threading.Thread(target=self.writer, daemon=True),
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            if self.stop.is_set():
+                executor.shutdown(cancel_futures=True)
+
+        self.crawler.browser_session.close()
+
+        if self.error is not None:
+            # Resume from the first song that was not written, like webcrawl.main does on error
+            self.crawler.write_index(self.next_to_write, 0)
+
+        print("Done!")
+        return self.error is None
+
+def main():
+    # Imported here so that analysis worker processes do not load selenium/pyaudio/the dataset
+    import webcrawl
+
+    webcrawl.prepare_logs()
+
+    start = webcrawl.read_current_index()["index"]
+    print(f"Starting from index {start}")
+
+    if start != 0 and start % 100 == 0:
+        webcrawl.send_success_email(start / 100) # Send a success email with the batch number (per 100)
+
+    pipeline = CrawlPipeline(webcrawl, start, webcrawl.data_length)
+    if not pipeline.run():
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
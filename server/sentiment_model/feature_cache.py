@@ -0,0 +1,179 @@
+'''
+FEATURE CACHE:
+
+Content-addressed cache of feature summaries, so that re-analyzing a clip does not recompute librosa work
+that was already done.
+
+    - key:   hash of the decoded audio (float32 samples + sample rate), not of the file or the spotify_id
+    - block: one entry per feature (tempo, tempo_bt, rms, ..., chromagram) holding its [mean, std, min, max]
+             summary, stamped with the feature's version in feature_engine.feature_versions and the
+             extractor config (sample rate, STFT/mel parameters, librosa version)
+
+A clip whose blocks are all current costs one lookup. Bumping one feature's version (or adding a feature)
+only recomputes that block; the other blocks of the clip are still hits.
+
+Entries live in a SQLite file with a last-used timestamp per block. Once the stored blocks exceed
+`max_bytes`, the least recently used ones are evicted down to EVICT_TO of the limit.
+'''
+
+import hashlib
+import sqlite3
+import time
+
+import numpy as np
+
+from feature_engine import (
+    EXTRACTOR_CONFIG, feature_versions, extraction_profiles, compute_features, summarize,
+    features_to_json, feature_row,
+)
+
+cache_path = r"server/sentiment_model/feature_cache.sqlite3"
+
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+EVICT_TO = 0.9 # Evict down to this fraction of max_bytes, so eviction does not run on every insert
+
+# Tempo blocks: one value each, where every other block is summary rows per band
+rhythm_blocks = ("tempo", "tempo_bt")
+
+def audio_key(y, sr):
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(sr).encode())
+    digest.update(np.ascontiguousarray(y, dtype=np.float32).tobytes())
+    return digest.hexdigest()
+
+def block_version(name):
+    return f"{feature_versions[name]}/{EXTRACTOR_CONFIG}"
+
+# Cached form of a block: the summary rows, or the single tempo value as a 1-element array
+def block_summary(name, feature):
+    if name in rhythm_blocks:
+        return np.atleast_1d(np.asarray(feature, dtype=np.float64))[:1]
+    return summarize(feature)
+
+class FeatureCache:
+    def __init__(self, path=cache_path, max_bytes=CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.estimated_size = None # Running total of what this process added since the last real count
+
+        self.db = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL") # Worker processes read while another one writes
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS blocks (
+                clip TEXT NOT NULL,
+                block TEXT NOT NULL,
+                version TEXT NOT NULL,
+                bands INTEGER NOT NULL,
+                data BLOB NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (clip, block)
+            )
+        """)
+        self.db.execute("CREATE INDEX IF NOT EXISTS blocks_last_used ON blocks (last_used)")
+
+    def close(self):
+        self.db.close()
+
+    # Current-version blocks of a clip (stale versions count as misses); hits are marked as used
+    def get(self, clip):
+        rows = self.db.execute("SELECT block, version, bands, data FROM blocks WHERE clip = ?", (clip,)).fetchall()
+
+        blocks = {}
+        for block, version, bands, data in rows:
+            if block in feature_versions and version == block_version(block):
+                summary = np.frombuffer(data, dtype=np.float64)
+                blocks[block] = summary if block in rhythm_blocks else summary.reshape(bands, -1)
+
+        if blocks:
+            self.db.execute(
+                f"UPDATE blocks SET last_used = ? WHERE clip = ? AND block IN ({','.join('?' * len(blocks))})",
+                (time.time(), clip, *blocks),
+            )
+
+        return blocks
+
+    # Store (or replace stale versions of) some blocks of a clip
+    def put(self, clip, blocks):
+        now = time.time()
+        rows = [
+            (clip, name, block_version(name), summary.shape[0], np.asarray(summary, dtype=np.float64).tobytes(), now)
+            for name, summary in blocks.items()
+        ]
+        self.db.executemany(
+            "INSERT OR REPLACE INTO blocks (clip, block, version, bands, data, last_used) VALUES (?, ?, ?, ?, ?, ?)", rows
+        )
+
+        # Only count the whole table when the cheap estimate says the limit may have been crossed
+        if self.estimated_size is None:
+            self.estimated_size = self.size()
+        else:
+            self.estimated_size += sum(len(row[4]) for row in rows)
+
+        if self.estimated_size > self.max_bytes:
+            self.estimated_size = self.size()
+            if self.estimated_size > self.max_bytes:
+                self.evict()
+                self.estimated_size = self.size()
+
+    def size(self):
+        return self.db.execute("SELECT COALESCE(SUM(LENGTH(data)), 0) FROM blocks").fetchone()[0]
+
+    # Drop least recently used blocks until the cache is back under EVICT_TO * max_bytes
+    def evict(self):
+        target = self.max_bytes * EVICT_TO
+        size = self.size()
+        evicted = 0
+
+        while size > target:
+            rows = self.db.execute(
+                "SELECT rowid, LENGTH(data) FROM blocks ORDER BY last_used LIMIT 1000"
+            ).fetchall()
+            if not rows:
+                break
+
+            doomed = []
+            for rowid, length in rows:
+                if size <= target:
+                    break
+                doomed.append((rowid,))
+                size -= length
+
+            self.db.executemany("DELETE FROM blocks WHERE rowid = ?", doomed)
+            evicted += len(doomed)
+
+        return evicted
+
+_open_caches = {}
+
+# One connection per cache file and process (batch_extract's workers each open their own)
+def open_feature_cache(path=cache_path):
+    if path not in _open_caches:
+        _open_caches[path] = FeatureCache(path)
+
+    return _open_caches[path]
+
+# Summaries of every block, computing (and caching) only the missing or stale ones
+# (the result works as both the `features` and the `summaries` argument of features_to_json/feature_row)
+def cached_summaries(y, sr, cache, profile="full"):
+    clip = audio_key(y, sr)
+    summaries = cache.get(clip)
+    missing = [name for name in extraction_profiles[profile] if name not in summaries]
+
+    if missing:
+        features = compute_features(y, sr, skip=set(summaries), profile=profile)
+        computed = {name: block_summary(name, features[name]) for name in missing}
+        cache.put(clip, computed)
+        summaries.update(computed)
+
+    # Cached blocks outside the profile are left out, as compute_features would
+    return {name: summaries[name] for name in extraction_profiles[profile]}
+
+# Same output as extract_features()/feature_row(), served from the cache where possible
+def cached_extract_features(y, sr, cache, profile="full"):
+    summaries = cached_summaries(y, sr, cache, profile)
+    return features_to_json(summaries, summaries)
+
+def cached_feature_row(y, sr, cache, out=None, profile="full"):
+    summaries = cached_summaries(y, sr, cache, profile)
+    return feature_row(summaries, summaries, out=out)
@@ -0,0 +1,223 @@
+'''
+FEATURE ENGINE:
+
+Every spectral feature used to be computed straight from `y`, which made librosa rebuild the same
+STFT (and the same mel spectrogram) once per feature. Here the magnitude STFT and the mel spectrogram
+are computed ONCE per clip and every feature is derived from those shared intermediates.
+
+The STFT/mel parameters are librosa's defaults, so the values match the old per-feature calls:
+    - S       = |stft(y)|           -> centroid, bandwidth, contrast, flatness, rolloff
+    - S ** 2  (power spectrogram)   -> chroma_stft
+    - mel_db  = power_to_db(mel(S)) -> mfcc, onset envelopes (tempo + tempo_bt, one pass: see rhythm.py)
+    - rms/zcr are time-domain framings of `y` and never needed an STFT
+
+Not every caller needs every feature: an extraction profile (extraction_profiles) names the blocks to
+compute, and each intermediate is only computed when one of those blocks asks for it, e.g. a profile
+without chroma/contrast/beat_track never runs them, and rms/zcr alone never run an STFT.
+
+pcm_to_audio() turns captured PyAudio frames into the same `y, sr` that lib.load() gives for the WAV
+(int16 -> float32, stereo -> mono, 44.1 kHz -> 22.05 kHz), without the round-trip through the disk.
+'''
+
+import time
+
+import librosa as lib
+import numpy as np
+
+import rhythm
+
+# The row layout (feature blocks, summary stats, column names and offsets) lives in feature_schema.py
+from feature_schema import (
+    N_MFCC, feature_layout, feature_bands, summary_stats, summary_keys, feature_columns, summary_offsets,
+)
+
+SAMPLE_RATE = 22050 # lib.load() default
+N_FFT = 2048
+HOP_LENGTH = 512
+
+# Interleaved int16 frames -> float mono signal at the capture rate
+def pcm_to_mono(frames, channels):
+    if isinstance(frames, (list, tuple)):
+        frames = b"".join(frames)
+
+    pcm = np.frombuffer(frames, dtype=np.int16)
+    y = pcm.reshape(-1, channels).T.astype(np.float32) / 32768.0 # Interleaved -> (channels, samples)
+
+    return lib.to_mono(y)
+
+# Captured int16 frames -> float mono signal at SAMPLE_RATE (same steps as lib.load on the WAV)
+def pcm_to_audio(frames, channels, rate, sr=SAMPLE_RATE):
+    y = pcm_to_mono(frames, channels)
+
+    if rate != sr:
+        y = lib.resample(y, orig_sr=rate, target_sr=sr, res_type="soxr_hq")
+
+    return y, sr
+
+# Bump a feature's version whenever its computation changes: feature_cache.py then recomputes only that block
+feature_versions = {"tempo": 1, "tempo_bt": 1}
+feature_versions.update((prefix, 1) for prefix, _ in feature_layout)
+
+# Everything else a cached feature depends on
+EXTRACTOR_CONFIG = f"sr={SAMPLE_RATE} n_fft={N_FFT} hop={HOP_LENGTH} n_mfcc={N_MFCC} librosa={lib.__version__}"
+
+# Normalize all features into the same shape: reduce (bands, frames) to one [mean, std, min, max] row per band
+def summarize(feature, out=None):
+    feature = np.nan_to_num(feature)
+    if out is None:
+        out = np.empty((feature.shape[0], len(summary_stats)))
+
+    mean = feature.mean(axis=1)
+    out[:, 0] = mean
+    out[:, 1] = np.sqrt(np.mean(np.square(feature - mean[:, None]), axis=1)) # Same as np.std
+    out[:, 2] = feature.min(axis=1)
+    out[:, 3] = feature.max(axis=1)
+
+    return out
+
+# Summarize straight into the feature's slice of a preallocated row
+def summarize_into(row, feature, prefix):
+    offset = summary_offsets[prefix]
+    bands = feature.shape[0]
+
+    return summarize(feature, out=row[offset:offset + bands * len(summary_stats)].reshape(bands, -1))
+
+def assign_summary(json, feature, prefix):
+    write_summary(json, summarize(feature), prefix)
+
+# Write an already computed summary (one [mean, std, min, max] row per band) under the feature's keys
+def write_summary(json, summary_array, prefix):
+    summary_array = np.asarray(summary_array, dtype=np.float64)
+    keys = summary_keys(prefix, summary_array.shape[0])
+
+    json.update(zip(keys, summary_array.ravel().tolist()))
+
+# Shared intermediates, each computed on first use by the features that depend on it
+intermediate_functions = {
+    "S": lambda c: np.abs(lib.stft(c.y, n_fft=N_FFT, hop_length=HOP_LENGTH)), # Magnitude spectrogram
+    # Power mel spectrogram in dB (same filters as melspectrogram(y=y))
+    "mel_db": lambda c: lib.power_to_db(lib.feature.melspectrogram(S=c["S"]**2, sr=c.sr)),
+    # Rhythm: the mean (tempo) and median (beat_track) onset envelopes from one spectral flux pass
+    "onset_envelopes": lambda c: rhythm.onset_envelopes(c["mel_db"], N_FFT, HOP_LENGTH),
+    "onset_env": lambda c: c["onset_envelopes"][0],
+    "onset_env_bt": lambda c: c["onset_envelopes"][1],
+}
+
+# `timings` (optional dict) collects the wall time of every stage, excluding the stages it depends on
+class Intermediates:
+    def __init__(self, y, sr, precomputed=None, timings=None):
+        self.y = y
+        self.sr = sr
+        self.values = dict(precomputed or {})
+        self.timings = timings
+        self.nested = [0.0] # Time spent in the stages below the running one
+
+    def __getitem__(self, name):
+        if name not in self.values:
+            self.values[name] = self.timed(name, intermediate_functions[name])
+        return self.values[name]
+
+    def timed(self, name, function):
+        if self.timings is None:
+            return function(self)
+
+        start = time.perf_counter()
+        self.nested.append(0.0)
+
+        value = function(self)
+
+        elapsed = time.perf_counter() - start
+        self.timings[name] = elapsed - self.nested.pop()
+        self.nested[-1] += elapsed
+        return value
+
+# Compute the intermediates that every spectral feature is derived from
+def shared_spectrograms(y, sr):
+    intermediates = Intermediates(y, sr)
+    return intermediates["S"], intermediates["mel_db"]
+
+feature_functions = {
+    "tempo": lambda c: rhythm.global_tempo(c["onset_env"], c.sr, HOP_LENGTH),
+    "tempo_bt": lambda c: rhythm.beat_tempo(c["onset_env_bt"], c.sr, HOP_LENGTH), # beat_track's tempo, no beat DP
+    "rms": lambda c: lib.feature.rms(y=c.y), # Loudness
+    "zcr": lambda c: lib.feature.zero_crossing_rate(y=c.y), # Noisiness
+    "spec_centroid": lambda c: lib.feature.spectral_centroid(S=c["S"], sr=c.sr),
+    "spec_bandwidth": lambda c: lib.feature.spectral_bandwidth(S=c["S"], sr=c.sr),
+    "spec_contrast": lambda c: lib.feature.spectral_contrast(S=c["S"], sr=c.sr),
+    "spec_flatness": lambda c: lib.feature.spectral_flatness(S=c["S"]),
+    "spec_rolloff": lambda c: lib.feature.spectral_rolloff(S=c["S"], sr=c.sr),
+    "mfcc": lambda c: lib.feature.mfcc(S=c["mel_db"], n_mfcc=N_MFCC),
+    "chromagram": lambda c: lib.feature.chroma_stft(S=c["S"]**2, sr=c.sr), # Harmonic/pitch analysis
+}
+
+# Feature blocks per profile; "full" is what the training data (output.json) has always contained
+extraction_profiles = {
+    "full": list(feature_functions),
+    # No beat tempo, spectral contrast or chroma
+    "fast": ["tempo", "rms", "zcr", "spec_centroid", "spec_bandwidth", "spec_flatness", "spec_rolloff", "mfcc"],
+    "timbre-only": ["spec_centroid", "spec_bandwidth", "spec_contrast", "spec_flatness", "spec_rolloff", "mfcc"],
+}
+
+# `spectrograms` lets a caller that already has (S, mel_db) skip the STFT; `skip` leaves features out;
+# `timings` (optional dict) receives the seconds spent per stage (intermediates and features)
+def compute_features(y, sr, spectrograms=None, skip=(), profile="full", timings=None):
+    precomputed = dict(zip(("S", "mel_db"), spectrograms)) if spectrograms is not None else None
+    intermediates = Intermediates(y, sr, precomputed, timings)
+
+    features = {}
+    for name in extraction_profiles[profile]:
+        if name not in skip:
+            features[name] = intermediates.timed(name, feature_functions[name])
+
+    return features
+
+# Order in which the summaries are written
+summary_prefixes = [prefix for prefix, _ in feature_layout]
+
+# Flatten feature matrices (or summaries computed elsewhere) into the output keys
+def features_to_json(features, summaries=None):
+    summaries = summaries or {}
+
+    json_object = {}
+    for name in ("tempo", "tempo_bt"):
+        if name in features:
+            json_object[name] = float(np.atleast_1d(features[name])[0])
+
+    # Blocks that are not in the extraction profile are left out
+    for prefix in summary_prefixes:
+        if prefix in summaries:
+            write_summary(json_object, summaries[prefix], prefix)
+        elif prefix in features:
+            assign_summary(json_object, features[prefix], prefix)
+
+    return json_object
+
+# Same values as features_to_json, written into a float32 row laid out as `feature_columns`
+# (columns of blocks that are not in the extraction profile are NaN)
+def feature_row(features, summaries=None, out=None):
+    summaries = summaries or {}
+    row = np.empty(len(feature_columns), dtype=np.float32) if out is None else out
+
+    for i, name in enumerate(("tempo", "tempo_bt")):
+        row[i] = np.atleast_1d(features[name])[0] if name in features else np.nan
+
+    for prefix in summary_prefixes:
+        offset = summary_offsets[prefix]
+        if prefix in summaries:
+            summary_array = np.asarray(summaries[prefix])
+            row[offset:offset + summary_array.size] = summary_array.ravel()
+        elif prefix in features:
+            summarize_into(row, features[prefix], prefix)
+        else:
+            row[offset:offset + feature_bands[prefix] * len(summary_stats)] = np.nan
+
+    return row
+
+# Returns the flat feature object (tempo, tempo_bt, rms_*, spec_*, mfcc_*, chromagram_* for "full")
+def extract_features(y, sr, profile="full"):
+    return features_to_json(compute_features(y, sr, profile=profile))
+
+# Same, straight from captured int16 frames (picklable entry point for analysis worker processes)
+def extract_pcm_features(pcm, channels, rate, profile="full"):
+    y, sr = pcm_to_audio(pcm, channels, rate)
+    return extract_features(y, sr, profile)
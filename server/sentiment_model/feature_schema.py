@@ -0,0 +1,110 @@
+'''
+FEATURE SCHEMA:
+
+The one place the audio feature columns are defined. Every writer (feature_engine, batch_extract,
+webcrawl_cleansing, csv_modify) and reader (siamese_triplet) takes the column names, their fixed index
+in a feature row and their dtype from here instead of typing the 154 names out again.
+
+A feature row is tempo, tempo_bt, then [mean, std, min, max] per band of every feature in
+`feature_layout`. Each feature is a contiguous block of columns, so a reader can take e.g. all MFCC
+columns of a (tracks, columns) matrix with `matrix[:, block_slice("mfcc")]`.
+
+The scripts in server/model import this module by path:
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sentiment_model"))
+'''
+
+from functools import lru_cache
+from operator import itemgetter
+
+import numpy as np
+
+N_MFCC = 13
+
+# (feature, bands) in column order
+feature_layout = [
+    ("rms", 1),
+    ("zcr", 1),
+    ("spec_centroid", 1),
+    ("spec_bandwidth", 1),
+    ("spec_contrast", 7),
+    ("spec_flatness", 1),
+    ("spec_rolloff", 1),
+    ("mfcc", N_MFCC),
+    ("chromagram", 12),
+]
+
+feature_bands = dict(feature_layout)
+
+summary_stats = ["mean", "std", "min", "max"]
+
+@lru_cache(maxsize=None)
+def summary_keys(prefix, bands):
+    # For vectors
+    if bands == 1:
+        return tuple(f"{prefix}_{stat}" for stat in summary_stats)
+
+    # For matrices
+    return tuple(f"{prefix}_{i}_{stat}" for i in range(1, bands + 1) for stat in summary_stats)
+
+# Column names of a full feature row (the same order as the csv headers downstream)
+feature_columns = ["tempo", "tempo_bt"]
+summary_offsets = {}
+
+for prefix, bands in feature_layout:
+    summary_offsets[prefix] = len(feature_columns)
+    feature_columns += summary_keys(prefix, bands)
+
+feature_columns = tuple(feature_columns)
+
+# Column name -> fixed index in a feature row
+feature_index = {column: index for index, column in enumerate(feature_columns)}
+
+# Every audio feature is stored as float32 in the matrices (the JSON/csv outputs keep full precision)
+AUDIO_DTYPE = np.float32
+
+# Per-track metadata that goes in front of the audio columns in the csv outputs
+metadata_dtypes = {
+    "index": np.int64,
+    "track": object,
+    "artist": object,
+    "number_of_emotion_tags": np.float32,
+    "valence_tags": np.float32,
+    "arousal_tags": np.float32,
+    "dominance_tags": np.float32,
+    "spotify_id": object,
+}
+
+metadata_columns = tuple(metadata_dtypes)
+
+# The metadata of the semantic-only outputs (no spotify_id)
+semantic_columns = tuple(column for column in metadata_columns if column != "spotify_id")
+
+column_dtypes = dict(metadata_dtypes)
+column_dtypes.update((column, AUDIO_DTYPE) for column in feature_columns)
+
+# Columns of one feature block (tempo and tempo_bt are one column each)
+def block_slice(prefix):
+    if prefix in ("tempo", "tempo_bt"):
+        return slice(feature_index[prefix], feature_index[prefix] + 1)
+
+    offset = summary_offsets[prefix]
+    return slice(offset, offset + feature_bands[prefix] * len(summary_stats))
+
+_get_audio_values = itemgetter(*feature_columns)
+
+# A track's feature values in column order (None where the track has no value)
+def audio_values(track):
+    try:
+        return _get_audio_values(track)
+    except KeyError:
+        return tuple(track.get(column) for column in feature_columns)
+
+# Fill a preallocated (tracks, columns) matrix in one conversion; missing values (None) become NaN
+def audio_matrix(tracks, dtype=AUDIO_DTYPE, out=None):
+    if out is None:
+        out = np.empty((len(tracks), len(feature_columns)), dtype=dtype)
+
+    if len(tracks):
+        out[:] = [audio_values(track) for track in tracks]
+
+    return out
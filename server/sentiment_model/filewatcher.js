@@ -2,16 +2,21 @@ import chokidar from "chokidar";
 import fs from "fs";
 import WebSocket, { WebSocketServer } from "ws";
 
-const watcher = chokidar.watch("./current_index.json");
+// multi_lane_crawl.py starts one watcher per lane, each with its own index file and port
+const lane = process.env.LANE;
+const indexPath = lane === undefined ? "./current_index.json" : `./current_index_lane${lane}.json`;
+const port = lane === undefined ? 8080 : 8090 + Number(lane);
 
-const wss = new WebSocketServer({ port: 8080 });
+const watcher = chokidar.watch(indexPath);
+
+const wss = new WebSocketServer({ port: port });
 
 wss.on("connection", () => {
   console.log("Client connected");
 });
 
 watcher.on("change", (path) => {
-  const rawData = fs.readFileSync("./current_index.json", "utf-8");
+  const rawData = fs.readFileSync(indexPath, "utf-8");
   const data = JSON.parse(rawData);
   // console.log(data);
   const track = data.track;
@@ -19,4 +24,4 @@ watcher.on("change", (path) => {
   wss.clients.forEach((client) => client.send(rawData));
 });
 
-console.log("WebSocket Server running on port 8080");
+console.log(`WebSocket Server running on port ${port}`);
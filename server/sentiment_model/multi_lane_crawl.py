@@ -0,0 +1,166 @@
+'''
+MULTI-LANE CRAWLER:
+
+webcrawl.py records one song at a time: one player tab, one recorder on the hard-coded DEVICE_INDEX. Here
+N lanes crawl side by side, each with
+    - its own slice of muse_v3.json (disjoint and contiguous; saved in lanes.json so a rerun resumes them)
+    - its own PulseAudio null sink: Chrome plays into crawl_lane_<k> (PULSE_SINK) and the recorder reads
+      crawl_lane_<k>.monitor (PULSE_SOURCE), so the lanes never hear each other
+    - its own current_index_lane<k>.json + filewatcher (WebSocket port 8090 + k) + player tab (?lane=k)
+    - its own webcrawl.py process (CRAWL_LANE=k), appending to the shared output/comparison logs
+
+Spotify only streams to one device per account at a time, so every lane needs its own account: set
+PLAYER_REFRESH_TOKEN_<k> in server/.env for k = 0 .. N-1.
+
+Linux/PulseAudio (or PipeWire with pipewire-pulse) only. Same run instructions as webcrawl.py, except that
+the filewatchers are started here instead of `npm start`, then:
+`python server/sentiment_model/multi_lane_crawl.py <lanes>`
+'''
+
+import json
+import os
+import subprocess
+import sys
+
+SENTIMENT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(os.path.dirname(SENTIMENT_DIR)) # webcrawl.py's paths are relative to the repo root
+LANES_PATH = os.path.join(SENTIMENT_DIR, "lanes.json")
+DEFAULT_LANES = 2
+
+def sink_name(lane):
+    return f"crawl_lane_{lane}"
+
+def load_sink(lane):
+    module = subprocess.run(
+        ["pactl", "load-module", "module-null-sink", f"sink_name={sink_name(lane)}",
+         f"sink_properties=device.description={sink_name(lane)}"],
+        check=True, capture_output=True, text=True,
+    )
+    return module.stdout.strip() # Module id, for unload_sink
+
+def unload_sink(module_id):
+    subprocess.run(["pactl", "unload-module", module_id], check=False)
+
+# Split [start, end) into `lanes` contiguous slices of (almost) equal size
+def split_range(start, end, lanes):
+    size, extra = divmod(end - start, lanes)
+    slices = []
+    for lane in range(lanes):
+        stop = start + size + (1 if lane < extra else 0)
+        slices.append((start, stop))
+        start = stop
+    return slices
+
+# Reuse the slices of an earlier run with the same lane count; every lane resumes from its own index file
+def lane_slices(crawler, lanes):
+    if os.path.exists(LANES_PATH):
+        with open(LANES_PATH, mode="r", encoding="utf-8") as f:
+            slices = [tuple(s) for s in json.load(f)]
+        if len(slices) == lanes:
+            return slices
+        # Restart from the least advanced lane (songs done past it are written again; export dedupes them)
+        print(f"lanes.json has {len(slices)} lanes, not {lanes}: slicing again from the lane indices")
+        start = min(lane_start(crawler, lane, start) for lane, (start, _) in enumerate(slices))
+    else:
+        start = crawler.read_current_index()["index"]
+
+    slices = split_range(start, crawler.data_length, lanes)
+    for lane, (start, _) in enumerate(slices):
+        crawler.write_index_atomic(lane_index_path(lane), {
+            "status": 1,
+            "index": start,
+            "spotify_id": crawler.muse_index[start]["spotify_id"] if start < crawler.data_length else None,
+            "track": crawler.muse_index[start]["track"] if start < crawler.data_length else None,
+        })
+
+    crawler.write_index_atomic(LANES_PATH, slices)
+    return slices
+
+def lane_index_path(lane):
+    return os.path.join(SENTIMENT_DIR, f"current_index_lane{lane}.json")
+
+def lane_start(crawler, lane, default):
+    path = lane_index_path(lane)
+    if not os.path.exists(path):
+        return default
+    with open(path, mode="r", encoding="utf-8") as f:
+        return json.load(f)["index"]
+
+def start_lane(lane, start, end):
+    sink = sink_name(lane)
+
+    watcher = subprocess.Popen(
+        ["node", "filewatcher.js"],
+        cwd=SENTIMENT_DIR,
+        env={**os.environ, "LANE": str(lane)},
+    )
+
+    crawler = subprocess.Popen(
+        [sys.executable, os.path.join(SENTIMENT_DIR, "webcrawl.py")],
+        cwd=ROOT_DIR,
+        env={
+            **os.environ,
+            "CRAWL_LANE": str(lane),
+            "LANE_START": str(start),
+            "LANE_END": str(end),
+            "PULSE_SINK": sink, # Chrome (started by the lane's webdriver) plays into the lane's sink
+            "PULSE_SOURCE": f"{sink}.monitor", # and the lane's recorder captures only that sink
+        },
+    )
+
+    return watcher, crawler
+
+def main(lanes=DEFAULT_LANES):
+    # Imported here: the lanes are separate processes, this one only needs the dataset and the index files
+    import webcrawl
+
+    # Once, before the lanes start appending to the shared logs
+    webcrawl.prepare_logs()
+
+    slices = lane_slices(webcrawl, lanes)
+
+    if webcrawl.USE_WORK_QUEUE:
+        # Seeded here so that the lanes only lease; what the lanes crawled before the queue counts as done
+        webcrawl.open_work_queue(
+            done=[(start, lane_start(webcrawl, lane, start)) for lane, (start, _) in enumerate(slices)]
+        ).close()
+
+    modules = []
+    processes = []
+
+    try:
+        for lane, (start, end) in enumerate(slices):
+            resume = lane_start(webcrawl, lane, start)
+            if resume >= end and not webcrawl.USE_WORK_QUEUE:
+                print(f"Lane {lane}: slice [{start}, {end}) already done")
+                continue
+
+            modules.append(load_sink(lane))
+            processes.append((lane,) + start_lane(lane, start, end))
+            print(f"Lane {lane}: crawling [{resume}, {end})")
+
+        # webcrawl.main stops a lane on an error without failing; its index file tells whether it finished
+        failed = []
+        for lane, watcher, crawler in processes:
+            crawler.wait()
+            if webcrawl.USE_WORK_QUEUE:
+                if crawler.returncode != 0:
+                    failed.append(lane)
+            elif lane_start(webcrawl, lane, 0) < slices[lane][1]:
+                failed.append(lane)
+    finally:
+        for _, watcher, crawler in processes:
+            for process in (crawler, watcher):
+                if process.poll() is None:
+                    process.terminate()
+        for module_id in modules:
+            unload_sink(module_id)
+
+    if failed:
+        print(f"Lanes {failed} stopped early; run again to resume them")
+        sys.exit(1)
+
+    print("Done!")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_LANES)
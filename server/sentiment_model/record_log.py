@@ -0,0 +1,125 @@
+'''
+RECORD LOG:
+
+Append-only replacement for the load -> append -> dump cycle on output.json and comparison.json.
+
+Each record is one JSON object per line (.jsonl). Appending writes a single line and fsyncs it, so the
+cost per song is constant instead of growing with the file, and a crash can at worst leave one partial
+line at the end. recover_log() cuts that partial tail off before the next run appends to the file.
+
+The downstream scripts still expect a JSON array, which export_json_array() produces (the latest record
+per spotify_id, so songs crawled more than once appear once):
+
+`python server/sentiment_model/record_log.py export server/sentiment_model/output.jsonl server/sentiment_model/output.json`
+'''
+
+import json
+import os
+import sys
+
+# Cut off a partially written last record (no trailing newline or unparseable line)
+def recover_log(path):
+    if not os.path.exists(path):
+        return 0
+
+    with open(path, mode="rb+") as f:
+        size = f.seek(0, os.SEEK_END)
+        end = size
+
+        while end > 0:
+            # Find the start of the last line
+            start = end - 1
+            while start > 0:
+                f.seek(start - 1)
+                if f.read(1) == b"\n":
+                    break
+                start -= 1
+
+            f.seek(start)
+            line = f.read(end - start)
+
+            if line.endswith(b"\n"):
+                try:
+                    json.loads(line)
+                    break
+                except ValueError:
+                    pass
+
+            end = start
+
+        if end != size:
+            f.truncate(end)
+            f.flush()
+            os.fsync(f.fileno())
+            print(f"Recovered {path}: dropped {size - end} bytes of incomplete records")
+
+    return size - end
+
+# Append one record and make sure it is on disk before returning
+def append_record(path, record):
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+
+    with open(path, mode="ab") as f:
+        f.write(line.encode("utf-8"))
+        f.flush()
+        os.fsync(f.fileno())
+
+def read_records(path):
+    if not os.path.exists(path):
+        return
+
+    with open(path, mode="r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+# Seed a new log from an existing JSON array file (one-time migration of output.json/comparison.json)
+def import_json_array(json_path, log_path):
+    if os.path.exists(log_path) or not os.path.exists(json_path):
+        return 0
+
+    with open(json_path, mode="r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    temp = log_path + ".tmp"
+    with open(temp, mode="w", encoding="utf-8") as f:
+        for record in data:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp, log_path)
+
+    print(f"Imported {len(data)} records from {json_path}")
+    return len(data)
+
+# Compaction: write the log out as the JSON array the rest of the pipeline reads
+def export_json_array(log_path, json_path, dedupe_key="spotify_id"):
+    records = list(read_records(log_path))
+
+    # Keep only the latest record per key (e.g. songs that were re-crawled after a failure); records
+    # without the key are all kept
+    if dedupe_key is not None:
+        latest = {}
+        for position, record in enumerate(records):
+            key = record.get(dedupe_key, ("missing", position))
+            latest.pop(key, None)
+            latest[key] = record
+        records = list(latest.values())
+
+    temp = json_path + ".tmp"
+    with open(temp, mode="w", encoding="utf-8") as f:
+        json.dump(records, f, indent=2)
+    os.replace(temp, json_path)
+
+    print(f"Exported {len(records)} records to {json_path}")
+    return len(records)
+
+if __name__ == "__main__":
+    if len(sys.argv) < 4 or sys.argv[1] != "export":
+        print("Usage: record_log.py export <log.jsonl> <output.json> [dedupe_key|none]")
+        sys.exit(1)
+
+    dedupe_key = sys.argv[4] if len(sys.argv) > 4 else "spotify_id"
+
+    recover_log(sys.argv[2])
+    export_json_array(sys.argv[2], sys.argv[3], dedupe_key=None if dedupe_key == "none" else dedupe_key)
@@ -0,0 +1,39 @@
+'''
+RHYTHM:
+
+tempo and tempo_bt from a single onset pass.
+
+Both onset envelopes librosa uses are aggregations of the same spectral flux of the mel spectrogram:
+lib.onset.onset_strength aggregates it with a mean (-> lib.feature.tempo) and beat_track with a median.
+onset_envelopes() computes the flux once and aggregates it both ways, with the same lag, centering pad
+and trimming as onset_strength, so the envelopes are identical.
+
+beat_track's tempo is only its tempo estimate on the median envelope: the beat positions from its dynamic
+programming pass were never used. beat_tempo() returns the same value without running that pass.
+'''
+
+import librosa as lib
+import numpy as np
+
+# Spectral flux of mel_db (dB), aggregated with a mean and with a median (onset_strength with lag=1, max_size=1)
+def onset_envelopes(mel_db, n_fft, hop_length):
+    flux = np.maximum(0.0, mel_db[:, 1:] - mel_db[:, :-1])
+
+    # onset_strength pads by the lag plus the centering offset and trims back to the number of frames
+    pad_width = 1 + n_fft // (2 * hop_length)
+    frames = mel_db.shape[1]
+
+    onset_env = np.pad(flux.mean(axis=0), (pad_width, 0))[:frames]
+    onset_env_bt = np.pad(np.median(flux, axis=0), (pad_width, 0))[:frames]
+
+    return onset_env, onset_env_bt
+
+def global_tempo(onset_env, sr, hop_length):
+    return lib.feature.tempo(onset_envelope=onset_env, sr=sr, hop_length=hop_length)
+
+# The tempo beat_track(onset_envelope=onset_env_bt) reports, without tracking the beats
+def beat_tempo(onset_env_bt, sr, hop_length):
+    if not onset_env_bt.any():
+        return 0.0 # beat_track's answer for a clip without onsets
+
+    return lib.feature.tempo(onset_envelope=onset_env_bt, sr=sr, hop_length=hop_length)
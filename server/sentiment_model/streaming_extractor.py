@@ -0,0 +1,202 @@
+'''
+STREAMING EXTRACTION:
+
+Runs the feature engine WHILE the clip is being recorded instead of after it. PyAudio chunks are pushed
+in as they arrive and a background thread
+    1. downmixes them to mono and resamples them to SAMPLE_RATE with a streaming soxr resampler
+    2. computes every STFT column (and its mel projection) as soon as its window is complete
+    3. keeps running mean/std/min/max per band for the features that only depend on their own frame
+       (spectral centroid, bandwidth, flatness and rolloff)
+
+When the recording ends, only the last few frames and the clip-level features are left to compute: rms/zcr
+(cheap time-domain framings), mfcc and spectral contrast (their dB conversion clips against the clip-wide
+maximum), chroma (the tuning estimate uses the whole clip) and the tempo estimates.
+
+The STFT matches lib.stft(y) (centered, zero padded, periodic Hann window), so the output is the same
+feature object as extract_features().
+'''
+
+import queue
+import threading
+
+import librosa as lib
+import numpy as np
+import soxr
+
+from feature_engine import SAMPLE_RATE, N_FFT, HOP_LENGTH, extraction_profiles, pcm_to_mono, compute_features, features_to_json
+
+# Features whose frames only depend on their own STFT column, so they can be summarized on the fly
+running_feature_functions = {
+    "spec_centroid": lambda S, sr: lib.feature.spectral_centroid(S=S, sr=sr),
+    "spec_bandwidth": lambda S, sr: lib.feature.spectral_bandwidth(S=S, sr=sr),
+    "spec_flatness": lambda S, sr: lib.feature.spectral_flatness(S=S),
+    "spec_rolloff": lambda S, sr: lib.feature.spectral_rolloff(S=S, sr=sr),
+}
+
+# Per-band running mean/std/min/max, merged one block of frames at a time (Welford/Chan update)
+class RunningSummary:
+    def __init__(self):
+        self.count = 0
+        self.mean = None
+        self.m2 = None
+        self.min = None
+        self.max = None
+
+    def update(self, block):
+        block = np.nan_to_num(block).astype(np.float64)
+        n = block.shape[1]
+        if n == 0:
+            return
+
+        block_mean = block.mean(axis=1)
+        block_m2 = ((block - block_mean[:, None]) ** 2).sum(axis=1)
+
+        if self.count == 0:
+            self.mean, self.m2 = block_mean, block_m2
+            self.min, self.max = block.min(axis=1), block.max(axis=1)
+        else:
+            total = self.count + n
+            delta = block_mean - self.mean
+            self.mean = self.mean + delta * n / total
+            self.m2 = self.m2 + block_m2 + delta**2 * self.count * n / total
+            self.min = np.minimum(self.min, block.min(axis=1))
+            self.max = np.maximum(self.max, block.max(axis=1))
+
+        self.count += n
+
+    # Same layout as summarize(): one [mean, std, min, max] row per band
+    def summary(self):
+        return np.stack([self.mean, np.sqrt(self.m2 / self.count), self.min, self.max], axis=1)
+
+class StreamingExtractor:
+    def __init__(self, channels, rate, sr=SAMPLE_RATE, expected_seconds=15, profile="full"):
+        self.channels = channels
+        self.profile = profile
+        self.rate = rate
+        self.sr = sr
+        self.resampler = soxr.ResampleStream(rate, sr, 1, dtype="float32", quality="soxr_hq") if rate != sr else None
+        self.input_samples = 0
+
+        # Signal with the STFT's centering pad in front (N_FFT // 2 zeros, as in lib.stft)
+        self.pad = N_FFT // 2
+        self.signal = np.zeros(self.pad + int(expected_seconds * sr) + N_FFT, dtype=np.float32)
+        self.length = self.pad
+
+        self.window = lib.filters.get_window("hann", N_FFT, fftbins=True).astype(np.float32)
+        self.mel_basis = lib.filters.mel(sr=sr, n_fft=N_FFT)
+        self.frames = 0
+        self.S_blocks = []
+        self.mel_blocks = []
+        self.running = {name: RunningSummary() for name in running_feature_functions if name in extraction_profiles[profile]}
+
+        self.y = None
+        self.error = None
+        self.chunks = queue.Queue()
+        self.worker = threading.Thread(target=self._run, daemon=True)
+        self.worker.start()
+
+    # Called from the recording loop; the work happens on the background thread
+    def push(self, chunk):
+        self.chunks.put(chunk)
+
+    def _run(self):
+        while True:
+            chunk = self.chunks.get()
+            if chunk is None:
+                return
+            if self.error is not None:
+                continue
+
+            try:
+                self._consume(chunk)
+            except Exception as e:
+                self.error = e
+
+    def _consume(self, chunk):
+        y = pcm_to_mono(chunk, self.channels)
+        self.input_samples += len(y)
+
+        if self.resampler is not None:
+            y = self.resampler.resample_chunk(y)
+
+        self._append(y)
+
+        # Hold back the frames at the very end: the final resampled length is only known in finish()
+        self._analyze(self.length - HOP_LENGTH)
+
+    def _append(self, y):
+        needed = self.length + len(y)
+        if needed > len(self.signal):
+            grown = np.zeros(max(needed, 2 * len(self.signal)), dtype=np.float32)
+            grown[:self.length] = self.signal[:self.length]
+            self.signal = grown
+
+        self.signal[self.length:needed] = y
+        self.length = needed
+
+    # Compute every STFT frame whose window ends before `end`
+    def _analyze(self, end):
+        if end < N_FFT:
+            return
+
+        available = (end - N_FFT) // HOP_LENGTH + 1
+        if available <= self.frames:
+            return
+
+        start = self.frames * HOP_LENGTH
+        stop = (available - 1) * HOP_LENGTH + N_FFT
+        frames = np.lib.stride_tricks.sliding_window_view(self.signal[start:stop], N_FFT)[::HOP_LENGTH]
+
+        S_block = np.abs(np.fft.rfft(frames * self.window, axis=-1)).T.astype(np.float32)
+        self.S_blocks.append(S_block)
+        self.mel_blocks.append(self.mel_basis @ S_block**2)
+
+        for name, running in self.running.items():
+            running.update(running_feature_functions[name](S_block, self.sr))
+
+        self.frames = available
+
+    # Stop the worker and drop the buffers without computing anything, e.g. when the recording failed;
+    # safe to call after finish() or more than once
+    def close(self):
+        if self.worker.is_alive():
+            self.chunks.put(None)
+            self.worker.join()
+
+        self.signal = None
+        self.S_blocks = []
+        self.mel_blocks = []
+
+    # Call once the recording has ended; returns the same object as extract_features()
+    def finish(self):
+        self.chunks.put(None)
+        self.worker.join()
+
+        if self.error is not None:
+            raise self.error
+
+        if self.resampler is not None:
+            self._append(self.resampler.resample_chunk(np.zeros(0, dtype=np.float32), last=True))
+            n = int(np.ceil(self.input_samples * self.sr / self.rate)) # lib.resample's output length
+        else:
+            n = self.input_samples
+
+        # Fix the length, then add the trailing centering pad and flush the remaining frames
+        end = self.pad + n
+        if self.length > end:
+            self.signal[end:self.length] = 0
+            self.length = end
+        else:
+            self._append(np.zeros(end - self.length, dtype=np.float32))
+
+        self._append(np.zeros(self.pad, dtype=np.float32))
+        self._analyze(self.length)
+
+        self.y = self.signal[self.pad:end].copy()
+        S = np.hstack(self.S_blocks)
+        mel_db = lib.power_to_db(np.hstack(self.mel_blocks))
+
+        features = compute_features(self.y, self.sr, spectrograms=(S, mel_db), skip=running_feature_functions, profile=self.profile)
+        summaries = {name: running.summary() for name, running in self.running.items()}
+
+        return features_to_json(features, summaries)
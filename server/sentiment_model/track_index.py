@@ -0,0 +1,45 @@
+'''
+TRACK INDEX:
+
+The MuSe dataset (muse_v3.json) loaded ONCE per process and indexed both by position and by spotify_id,
+so that analyze_audio, write_index and process_song look tracks up in O(1) instead of re-reading the
+whole file for every song.
+'''
+
+import copy
+import json
+
+class TrackIndex:
+    def __init__(self, tracks):
+        self.tracks = tracks
+        self.positions = {}
+
+        # First occurrence wins for the (few) spotify_ids that appear more than once
+        for position, track in enumerate(tracks):
+            self.positions.setdefault(track["spotify_id"], position)
+
+    def __len__(self):
+        return len(self.tracks)
+
+    def __getitem__(self, position):
+        return self.tracks[position]
+
+    def position_of(self, spotify_id):
+        return self.positions[spotify_id]
+
+    def by_spotify_id(self, spotify_id):
+        return self.tracks[self.positions[spotify_id]]
+
+    # Copy of a track to fill in with audio features (the index itself is never mutated)
+    def record(self, position):
+        return copy.deepcopy(self.tracks[position])
+
+_loaded_indexes = {}
+
+# Every caller in the same process shares one index per file
+def load_track_index(path):
+    if path not in _loaded_indexes:
+        with open(path, mode="r", encoding="utf-8") as f:
+            _loaded_indexes[path] = TrackIndex(json.load(f))
+
+    return _loaded_indexes[path]
@@ -12,17 +12,11 @@ After all these steps have been followed, simply run the python script below!
 
 import json
 import time
-import copy
-import sys
 
 # ------------------------------------------ WEBCRAWLER --------------------------------------------
 
-from selenium import webdriver
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support import expected_conditions as EC
 
 chrome_options = Options()
 chrome_options.add_argument("--log-level=3")
@@ -31,18 +25,30 @@ import pyaudio
 import wave
 import os
 
-def record_song():
-    # Delete old file
-    if os.path.exists(r"server\sentiment_model\output.wav"):
-        os.remove(r"server\sentiment_model\output.wav")
+# Set by multi_lane_crawl.py: each lane has its own player tab, index file and audio sink (None = single crawl)
+CRAWL_LANE = os.getenv("CRAWL_LANE")
 
-    CHUNK = 1024
-    FORMAT = pyaudio.paInt16
-    CHANNELS = 2
-    RATE = 44100
-    RECORD_SECONDS = 15
-    DEVICE_INDEX = 3
+from feature_engine import extract_pcm_features
+from streaming_extractor import StreamingExtractor
 
+# The clip is handed to the feature extractor in memory; the WAV is only written for debugging
+SAVE_DEBUG_WAV = False
+
+# Analyze the chunks while they are being recorded (False: analyze the whole clip after recording)
+STREAMING_EXTRACTION = True
+
+# Feature blocks to compute (feature_engine.extraction_profiles); the training data needs all of them
+EXTRACTION_PROFILE = "full"
+
+CHUNK = 1024
+FORMAT = pyaudio.paInt16
+CHANNELS = 2
+RATE = 44100
+RECORD_SECONDS = 15
+DEVICE_INDEX = 3 if CRAWL_LANE is None else None # Lanes record the default source (PULSE_SOURCE = lane sink monitor)
+
+# Record one clip and return the raw int16 frames; `on_chunk` sees every chunk as it is read
+def capture_pcm(on_chunk=None, save_wav=SAVE_DEBUG_WAV):
     p = pyaudio.PyAudio()
 
     stream = p.open(
@@ -62,238 +68,125 @@ def record_song():
         data = stream.read(CHUNK, exception_on_overflow=False)
         frames.append(data)
 
+        if on_chunk is not None:
+            on_chunk(data)
+
     print("Pyaudio done.")
 
     stream.stop_stream()
     stream.close()
     p.terminate()
 
-    wf = wave.open("server/sentiment_model/output.wav", "wb")
-    wf.setnchannels(CHANNELS)
-    wf.setsampwidth(p.get_sample_size(FORMAT))
-    wf.setframerate(RATE)
-    wf.writeframes(b"".join(frames))
-    wf.close()
+    pcm = b"".join(frames)
 
-def open_selenium(index):
-    driver = webdriver.Chrome(options=chrome_options)
-    link_to_crawl = "http://localhost:5173/"
+    if save_wav:
+        wf = wave.open("server/sentiment_model/output.wav", "wb")
+        wf.setnchannels(CHANNELS)
+        wf.setsampwidth(p.get_sample_size(FORMAT))
+        wf.setframerate(RATE)
+        wf.writeframes(pcm)
+        wf.close()
 
-    wait = WebDriverWait(driver, 20)
-    driver.get(link_to_crawl)
+    return pcm
 
-    wait.until(
-        EC.visibility_of_all_elements_located((By.TAG_NAME, "img"))
-    )
+# Returns the features and the raw frames (for the clip archive)
+def record_song(save_wav=SAVE_DEBUG_WAV):
+    if STREAMING_EXTRACTION:
+        extractor = StreamingExtractor(CHANNELS, RATE, expected_seconds=RECORD_SECONDS, profile=EXTRACTION_PROFILE)
+        try:
+            pcm = capture_pcm(on_chunk=extractor.push, save_wav=save_wav)
+            return extractor.finish(), pcm
+        finally:
+            # A failed capture would otherwise leave the worker thread blocked on its queue
+            extractor.close()
 
-    name = wait.until(
-        EC.presence_of_element_located((By.XPATH, "//div[@id='target-track-name']"))
-    )
+    pcm = capture_pcm(save_wav=save_wav)
 
-    track_name = name.text # Create a static variable to store value in; elem closing does not affect this
+    # Downmix + resample in-process instead of reading the WAV back with lib.load
+    return extract_pcm_features(pcm, CHANNELS, RATE, EXTRACTION_PROFILE), pcm
 
-    print(f"Name: {track_name}")
+# Every recorded clip is kept, so features can be recomputed without crawling again (see clip_archive.py)
+from clip_archive import ClipArchive, clip_archive_path
 
-    while True:
-        try:
-            elem = wait.until(
-                EC.element_to_be_clickable((By.XPATH, "//button[@id='target']"))
-            )
-
-            time.sleep(1)
-            
-            # if elem.text.lower() == "play":
-            #     elem.click()
-
-            # Ensure that audio is actually playing
-            i = 0
-            while elem.text.lower() != "pause":
-                if i >= 2:
-                    print("Too many attempts. Something is wrong with the while loop.")
-                    time.sleep(2)
-                    
-                    print("Resetting...")
-                    i = 0
-                    driver.refresh()
-
-                elem.click()
-                time.sleep(0.1)
-                
-                i += 1
-
-            print("Successfully clicked!")
-            
-            record_song()
-
-            time.sleep(1)
-
-            # If by THIS point, the audio is still not working, kill the program
-            if elem.text.lower() == "play":
-                print("Audio was not playing during iteration.")
-                sys.exit()
-
-            # Update the index in here -- gives it a bit more time to update
-            write_index(index + 1, 1)
-            print(f"Song {index}: Updated index to {index + 1}")
-
-            # prev = index
-
-            # wait.until(
-            #     lambda driver: driver.find_element(By.XPATH, "//div[@id='current-index']") == str(prev)
-            # )
-            
-            time.sleep(2)
-            
-            updated_index = driver.find_element(By.XPATH, "//div[@id='current-index']").text
-            print(f"[UPDATE] {updated_index}")
-
-            react_index = int(updated_index)
-            print(f"[WebPlayback.tsx] current_index: {react_index}")
-
-            time.sleep(1)
-
-            driver.quit()
-
-            print("Selenium done.")
-
-            return react_index, track_name
-        except Exception as e:
-            print("Retrying: ", e)
-            time.sleep(0.5)
+ARCHIVE_CLIPS = True
 
-# open_selenium()
+# Opened on the first clip: opening it writable creates the directory and takes the archive's lock, which
+# modules that only import webcrawl for its index files (multi_lane_crawl) must not do
+clip_archive = None
 
-# -------------------------------------- LIBROSA EXTRACTION --------------------------------------
+def archive_clip(spotify_id, pcm):
+    global clip_archive
 
-import librosa as lib
-import numpy as np
-
-# Normalize all features into the same shape
-def summarize(feature):
-    feature = np.nan_to_num(feature)
-    summary_array = []
-
-    for i in range (feature.shape[0]):
-        band = feature[i]
-
-        summary_array.append(
-            [
-                float(np.mean(band)),
-                float(np.std(band)),
-                float(np.min(band)),
-                float(np.max(band))
-            ]
-        )
-    
-    return summary_array
-
-def assign_summary(json, feature, prefix):
-    summary_array = summarize(feature)
-    # For vectors
-    if feature.shape[0] == 1:
-        mean, std, min, max = summary_array[0]
-        json[f"{prefix}_mean"] = mean
-        json[f"{prefix}_std"] = std
-        json[f"{prefix}_min"] = min
-        json[f"{prefix}_max"] = max
-
-    # For matrices
-    elif feature.shape[0] > 1:
-        for i, (mean, std, min, max) in enumerate(summary_array, start=1):
-            json[f"{prefix}_{i}_mean"] = mean
-            json[f"{prefix}_{i}_std"] = std
-            json[f"{prefix}_{i}_min"] = min
-            json[f"{prefix}_{i}_max"] = max
-
-def analyze_audio(audio_path, input_json_path, output_json_path, json_index):
-
-    ### Audio Analysis ###
-
-    y, sr = lib.load(audio_path)
-
-    onset_env = lib.onset.onset_strength(y=y, sr=sr)
-    tempo = lib.feature.tempo(onset_envelope=onset_env, sr=sr)
-    rms = lib.feature.rms(y=y) # Loudness
-    zcr = lib.feature.zero_crossing_rate(y=y) # Noisiness
-
-    spec_centroid = lib.feature.spectral_centroid(y=y, sr=sr) # This and next 4 are on the spectogram shape
-    spec_bandwidth = lib.feature.spectral_bandwidth(y=y, sr=sr)
-    spec_contrast = lib.feature.spectral_contrast(y=y, sr=sr)
-    spec_flatness = lib.feature.spectral_flatness(y=y)
-    spec_rolloff = lib.feature.spectral_rolloff(y=y, sr=sr)
-    mfcc = lib.feature.mfcc(y=y, sr=sr, n_mfcc=13)
-    chromagram = lib.feature.chroma_stft(y=y, sr=sr) # Harmonic/pitch analysis
-    tempo_bt, _ = lib.beat.beat_track(y=y, sr=sr, units='time')
+    if not ARCHIVE_CLIPS:
+        return
+    if clip_archive is None:
+        clip_archive = ClipArchive(clip_archive_path, writable=True)
 
-    ### Data Normalization ###
+    clip_archive.add(spotify_id, pcm, CHANNELS, RATE)
 
-    # Open input
-    with open(input_json_path, mode="r") as f:
-        input_json_data = json.load(f) # Type array
+# One browser window for the whole run (started on first use, restarted if it dies)
+from browser_session import BrowserSession, LINK_TO_CRAWL
 
-    # Open output
-    with open(output_json_path, mode="r") as f:
-        output_json_data = json.load(f)
-    
-    # Declare empty json object to append to overall array later
-    json_object = copy.deepcopy(input_json_data[json_index])
+link_to_crawl = LINK_TO_CRAWL if CRAWL_LANE is None else f"{LINK_TO_CRAWL}?lane={CRAWL_LANE}"
 
-    print("Here is the json_object:", json_object)
+# (write_index is defined further down, hence the lambda)
+browser_session = BrowserSession(chrome_options, write_index=lambda index, status: write_index(index, status), link=link_to_crawl)
 
-    # Tempo and Tempo_bt
-    json_object["tempo"] = float(tempo[0])
-    json_object["tempo_bt"] = float(tempo_bt[0])
+# `record` is what runs while the song plays (record_song, or capture_pcm for the pipelined crawler)
+def open_selenium(index, record=record_song):
+    # The last track has no next one to advance the player to
+    react_index, track_name, audio_features = browser_session.play_track(index, record, advance=index + 1 < data_length)
 
-    # RMS
-    assign_summary(json_object, rms, "rms")
+    print("Selenium done.")
 
-    # ZCR
-    assign_summary(json_object, zcr, "zcr")
+    return react_index, track_name, audio_features
 
-    # Spec Centroid
-    assign_summary(json_object, spec_centroid, "spec_centroid")
+# open_selenium()
 
-    # Spec Bandwidth
-    assign_summary(json_object, spec_bandwidth, "spec_bandwidth")
+# -------------------------------------- LIBROSA EXTRACTION --------------------------------------
 
-    # Spec Contrast
-    assign_summary(json_object, spec_contrast, "spec_contrast")
+# Results are appended one line at a time instead of rewriting the whole array (see record_log.py)
+from record_log import append_record, recover_log, import_json_array
 
-    # Spec Flatness
-    assign_summary(json_object, spec_flatness, "spec_flatness")
+# The features themselves are computed by record_song (see feature_engine.py/streaming_extractor.py)
+def analyze_audio(audio_features, track_index, json_index):
 
-    # Spec Rolloff
-    assign_summary(json_object, spec_rolloff, "spec_rolloff")
+    ### Data Normalization ###
 
-    # MFCC
-    assign_summary(json_object, mfcc, "mfcc")
+    # Declare empty json object to append to overall array later
+    json_object = track_index.record(json_index)
 
-    # Chromagram
-    assign_summary(json_object, chromagram, "chromagram")
+    print("Here is the json_object:", json_object)
 
-    # Append the completed json_object into the json_data array
-    output_json_data.append(json_object)
+    # Tempo, RMS, ZCR, Spectral features, MFCC and Chromagram summaries
+    json_object.update(audio_features)
 
-    # Dump the new addition the .json file featured in parameters
-    with open(output_json_path, mode="w") as f:
-        json.dump(output_json_data, f, indent=2)
-    
     print("Done!")
 
-    return json_object["spotify_id"], json_object["track"] # Comparison data in relation to open_selenium output
+    return json_object # spotify_id/track are the comparison data in relation to open_selenium output
 
-input_json_path = r"server\sentiment_model\muse_v3.json"
-output_json_path = r"server\sentiment_model\output.json"
+# Append the completed json_object to the output log (export to output.json with record_log.py); only
+# once track_name_comparison confirmed the recording is this song
+def save_record(json_object, output_log_path):
+    append_record(output_log_path, json_object)
+
+input_json_path = r"server/sentiment_model/muse_v3.json"
+output_json_path = r"server/sentiment_model/output.json"
+output_log_path = r"server/sentiment_model/output.jsonl"
 
 # ----------------------------------------- MAIN -------------------------------------------------
 
-# MUSE DATASET READ
-with open(input_json_path, mode="r") as f:
-    input_json_data = json.load(f)
+# MUSE DATASET READ (once; shared by analyze_audio, write_index and process_song)
+from track_index import load_track_index
+
+muse_index = load_track_index(input_json_path)
 
-data_length = len(input_json_data)
+data_length = len(muse_index)
 
-current_track_path = r"server\sentiment_model\current_index.json"
+current_track_path = r"server/sentiment_model/current_index.json"
+
+if CRAWL_LANE is not None:
+    current_track_path = f"server/sentiment_model/current_index_lane{CRAWL_LANE}.json"
 
 # CURRENT INDEX READ
 def read_current_index():
@@ -310,11 +203,11 @@ def write_index_atomic(path, data):
     os.replace(temp, path)
 
 def write_index(index, status):
-    write_index_atomic("server/sentiment_model/current_index.json", {
+    write_index_atomic(current_track_path, {
         "status": status,
         "index": index, 
-        "spotify_id": input_json_data[index]["spotify_id"],
-        "track": input_json_data[index]["track"]
+        "spotify_id": muse_index[index]["spotify_id"],
+        "track": muse_index[index]["track"]
     })
 
 # MUST HAVE SONG IN DATASET ALREADY IN CURRENT_INDEX.JSON
@@ -324,52 +217,55 @@ from email_sender import send_success_email, send_failure_email
 
 # Keep track of track that is inputted and track that is being outputted
 # TODO: Check if this works and also make sure that this appends new entries and NOT replaces them
+comparison_json_path = r"server/sentiment_model/comparison.json"
+comparison_log_path = r"server/sentiment_model/comparison.jsonl"
+
 def track_name_comparison(input_name, input_id, output_name, output_id):
-    with open(r"server/sentiment_model/comparison.json", mode="r") as f:
-        data = json.load(f)
-    
-    data.append({
+    append_record(comparison_log_path, {
         "input_id": input_id,
         "input_track_name": input_name,
         "output_id": output_id,
         "output_track_name": output_name,
     })
-    with open(r"server/sentiment_model/comparison.json", mode="w") as f:
-        json.dump(data, f, indent=2)
 
     if input_id != output_id:
         send_failure_email()
-        sys.exit() # Exit the script if the input_id != output_id
-
-audio_path = r"server\sentiment_model\output.wav"
+        # Raised (not sys.exit()) so the work queue records the error and retries the track
+        raise RuntimeError(f"input/output id mismatch: {input_id} != {output_id}")
 
 def process_song(index):
     # 0. Read the song
     # 1. Open selenium and record song
-    react_index, input_name = open_selenium(index)
-    input_id = input_json_data[react_index]["spotify_id"]
+    react_index, input_name, (audio_features, pcm) = open_selenium(index)
+    input_id = muse_index[react_index]["spotify_id"]
     print(f"Processing song {index}")
 
     # #2. Update index early so that there is less room for error (check if this works)
     # write_index(index + 1, 1)
     # print(f"Song {index}: Updated index to {index + 1}")
 
-    # 2. Extract and record audio features
-    output_id, output_name = analyze_audio(audio_path, input_json_path, output_json_path, index)
+    # 2. Extract the audio features
+    json_object = analyze_audio(audio_features, muse_index, index)
+    output_id, output_name = json_object["spotify_id"], json_object["track"]
     print(f"Song {index}: Audio analyzed")
 
     track_name_comparison(input_name=input_name, input_id=input_id, output_name=output_name, output_id=output_id)
 
-def main(start_index):
+    # 3. Record the features and keep the clip (only once the comparison confirmed it is this song)
+    save_record(json_object, output_log_path)
+    archive_clip(output_id, pcm)
+
+def main(start_index, end_index=None):
     index = start_index
+    end_index = data_length if end_index is None else end_index
 
     if index != 0 and index % 100 == 0:
         count = index / 100
         send_success_email(count) # Send a success email with the batch number (per 100)
     
-    while(index < data_length):
+    while(index < end_index):
         try:
-            print(f"\n=== Processing song {index}/{data_length} ===")
+            print(f"\n=== Processing song {index}/{end_index} ===")
             process_song(index)
             index += 1
 
@@ -377,9 +273,69 @@ def main(start_index):
             print(f"Error processing song {index}: {e}")
             write_index(index, 0)
             break
+
+    browser_session.close()
     
     print("Done!")
 
+# ---------------------------------------- WORK QUEUE ---------------------------------------------
+
+# Per-track crawl state (pending/in flight/done/failed) instead of walking current_index.json (see work_queue.py)
+from work_queue import WorkQueue, default_worker, queue_path
+
+USE_WORK_QUEUE = True
+
+# First run: queue every track and count the `done` [start, end) ranges (earlier progress) as crawled
+def open_work_queue(done=()):
+    work_queue = WorkQueue(queue_path)
+
+    if work_queue.seed(muse_index) == data_length:
+        for start, end in done:
+            work_queue.mark_done(start, end)
+
+    return work_queue
+
+# Crawl whatever the queue hands out in [start, end) until every track there is done or failed
+def queue_main(work_queue, start=0, end=None, worker=None):
+    worker = worker or default_worker()
+    player_index = None # The track the web player is on (play_track moves it to index + 1)
+
+    while True:
+        index = work_queue.lease(worker, start, end)
+
+        if index is None:
+            wait = work_queue.next_due(start, end)
+            if wait is None:
+                break
+            print(f"Waiting {wait:.0f}s for a retry to come due...")
+            time.sleep(wait)
+            continue
+
+        try:
+            print(f"\n=== Processing song {index} ===")
+
+            # Retries and other shards' leftovers are not where the player is
+            if index != player_index:
+                write_index(index, 1)
+
+            process_song(index)
+            done_count = work_queue.complete(index, worker)
+            player_index = index + 1
+
+            # Lanes share the queue: only the lane whose completion crossed a multiple of 100 sends the email
+            if done_count is not None and (done_count - 1) // 100 != done_count // 100:
+                send_success_email(done_count // 100) # Send a success email with the batch number (per 100)
+
+        except Exception as e:
+            print(f"Error processing song {index}: {e}")
+            player_index = None
+            state = work_queue.fail(index, worker, e)
+            print(f"Song {index}: {state}")
+
+    browser_session.close()
+
+    print("Done!", work_queue.counts())
+
 # def main(index): # Should have index to begin at just in case process gets paused
 #     # 1. Open selenium and record song
 #     open_selenium()
@@ -399,11 +355,29 @@ def main(start_index):
 #         print("Done!")
 #         return
 
+# Carry over the old JSON arrays once, then drop any record cut off by a previous crash
+def prepare_logs():
+    for json_path, log_path in [(output_json_path, output_log_path), (comparison_json_path, comparison_log_path)]:
+        import_json_array(json_path, log_path)
+        recover_log(log_path)
+
 if __name__ == "__main__":
+    # Lanes share the logs; multi_lane_crawl.py prepares them once before starting any lane
+    if CRAWL_LANE is None:
+        prepare_logs()
+
     current_state = read_current_index()
     start = current_state["index"]
-    print(f"Starting from index {start}")
 
-    main(start_index=start)
+    # A lane only crawls its own slice of the dataset
+    end = int(os.getenv("LANE_END", data_length))
+
+    if USE_WORK_QUEUE:
+        # The queue skips finished tracks itself; a lane's slice starts at LANE_START (multi_lane_crawl.py)
+        work_queue = open_work_queue(done=[(0, start)])
+        queue_main(work_queue, start=int(os.getenv("LANE_START", 0)), end=end)
+    else:
+        print(f"Starting from index {start}")
+        main(start_index=start, end_index=end)
 
 # TODO: FIGURE OUT THIS FILE I/O SYSTEM
\ No newline at end of file
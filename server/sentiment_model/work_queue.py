@@ -0,0 +1,207 @@
+'''
+WORK QUEUE:
+
+Persistent per-track crawl state in a local SQLite file, instead of the single index in current_index.json.
+
+Every track of muse_v3.json is one row:
+    - pending:   not crawled yet, or waiting for a retry (`next_attempt` is when it may run again)
+    - in_flight: leased by a worker until `lease_expires`; a worker that dies simply lets its lease expire
+    - done:      features written to the output log
+    - failed:    gave up after MAX_ATTEMPTS (`last_error` says why); `retry-failed` puts them back
+
+Workers lease the lowest pending position of their shard (a [start, end) range of positions, e.g. one
+multi-lane crawl lane) inside an IMMEDIATE transaction, so concurrent processes never get the same track.
+A failed song is retried with exponential backoff and the worker moves on to the next one meanwhile.
+
+`python server/sentiment_model/work_queue.py status`
+`python server/sentiment_model/work_queue.py retry-failed`
+'''
+
+import os
+import socket
+import sqlite3
+import sys
+import time
+
+queue_path = r"server/sentiment_model/crawl_queue.sqlite3"
+
+MAX_ATTEMPTS = 3
+LEASE_SECONDS = 300 # A song takes ~20s; an expired lease means the worker is gone
+RETRY_BASE_SECONDS = 30 # Backoff: 30s, 60s, 120s, ...
+RETRY_MAX_SECONDS = 3600
+
+PENDING = "pending"
+IN_FLIGHT = "in_flight"
+DONE = "done"
+FAILED = "failed"
+STATES = (PENDING, IN_FLIGHT, DONE, FAILED)
+
+def retry_delay(attempts):
+    return min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS)
+
+def default_worker():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+class WorkQueue:
+    def __init__(self, path=queue_path, max_attempts=MAX_ATTEMPTS, lease_seconds=LEASE_SECONDS):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+
+        # Autocommit; transactions are opened explicitly where a read has to be followed by a write
+        self.db = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL") # Readers never block the worker that is leasing
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS tracks (
+                position INTEGER PRIMARY KEY,
+                spotify_id TEXT NOT NULL,
+                state TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt REAL NOT NULL DEFAULT 0,
+                lease_owner TEXT,
+                lease_expires REAL,
+                last_error TEXT
+            )
+        """)
+        self.db.execute("CREATE INDEX IF NOT EXISTS tracks_state ON tracks (state, position)")
+
+    def close(self):
+        self.db.close()
+
+    # Add every track that is not queued yet; returns how many were added
+    def seed(self, track_index):
+        before = self.db.total_changes
+        with self.transaction():
+            self.db.executemany(
+                "INSERT OR IGNORE INTO tracks (position, spotify_id) VALUES (?, ?)",
+                ((position, track["spotify_id"]) for position, track in enumerate(track_index.tracks)),
+            )
+        return self.db.total_changes - before
+
+    # Mark [start, end) done without crawling it (carrying over the progress of current_index.json)
+    def mark_done(self, start, end):
+        self.db.execute(
+            "UPDATE tracks SET state = ? WHERE position >= ? AND position < ? AND state = ?",
+            (DONE, start, end, PENDING),
+        )
+
+    def transaction(self):
+        return _Transaction(self.db)
+
+    # Lease the next runnable track of the shard: pending and due, or in flight with an expired lease
+    def lease(self, worker, start=0, end=None):
+        now = time.time()
+        end = sys.maxsize if end is None else end
+
+        with self.transaction():
+            row = self.db.execute(
+                """
+                SELECT position FROM tracks
+                WHERE position >= ? AND position < ?
+                  AND ((state = ? AND next_attempt <= ?) OR (state = ? AND lease_expires < ?))
+                ORDER BY position LIMIT 1
+                """,
+                (start, end, PENDING, now, IN_FLIGHT, now),
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            self.db.execute(
+                "UPDATE tracks SET state = ?, lease_owner = ?, lease_expires = ? WHERE position = ?",
+                (IN_FLIGHT, worker, now + self.lease_seconds, row[0]),
+            )
+
+        return row[0]
+
+    # The number of done tracks right after this one (counted in the same transaction), or None when the
+    # lease was lost and the track was not this worker's to complete
+    def complete(self, position, worker):
+        with self.transaction():
+            updated = self.db.execute(
+                "UPDATE tracks SET state = ?, lease_owner = NULL, lease_expires = NULL, last_error = NULL "
+                "WHERE position = ? AND lease_owner = ?",
+                (DONE, position, worker),
+            ).rowcount
+            if not updated:
+                return None
+            return self.db.execute("SELECT COUNT(*) FROM tracks WHERE state = ?", (DONE,)).fetchone()[0]
+
+    # Back to pending with a backoff, or failed for good after max_attempts
+    def fail(self, position, worker, error):
+        with self.transaction():
+            row = self.db.execute(
+                "SELECT attempts FROM tracks WHERE position = ? AND lease_owner = ?", (position, worker)
+            ).fetchone()
+
+            if row is None:
+                return None # The lease expired and another worker has the track now
+
+            attempts = row[0] + 1
+            state = FAILED if attempts >= self.max_attempts else PENDING
+
+            self.db.execute(
+                "UPDATE tracks SET state = ?, attempts = ?, next_attempt = ?, lease_owner = NULL, "
+                "lease_expires = NULL, last_error = ? WHERE position = ?",
+                (state, attempts, time.time() + retry_delay(attempts), str(error), position),
+            )
+
+        return state
+
+    # Seconds until the shard may have work again (a retry comes due or a lease expires); None when finished
+    def next_due(self, start=0, end=None):
+        end = sys.maxsize if end is None else end
+        row = self.db.execute(
+            """
+            SELECT MIN(CASE WHEN state = ? THEN next_attempt ELSE lease_expires END) FROM tracks
+            WHERE position >= ? AND position < ? AND state IN (?, ?)
+            """,
+            (PENDING, start, end, PENDING, IN_FLIGHT),
+        ).fetchone()
+
+        if row[0] is None:
+            return None
+        return max(0.0, row[0] - time.time())
+
+    def retry_failed(self):
+        return self.db.execute(
+            "UPDATE tracks SET state = ?, attempts = 0, next_attempt = 0 WHERE state = ?", (PENDING, FAILED)
+        ).rowcount
+
+    def counts(self):
+        counts = dict.fromkeys(STATES, 0)
+        counts.update(self.db.execute("SELECT state, COUNT(*) FROM tracks GROUP BY state").fetchall())
+        return counts
+
+    def failures(self):
+        return self.db.execute(
+            "SELECT position, spotify_id, attempts, last_error FROM tracks WHERE state = ? ORDER BY position",
+            (FAILED,),
+        ).fetchall()
+
+# BEGIN IMMEDIATE takes the write lock up front, so two workers cannot select the same pending row
+class _Transaction:
+    def __init__(self, db):
+        self.db = db
+
+    def __enter__(self):
+        self.db.execute("BEGIN IMMEDIATE")
+
+    def __exit__(self, exc_type, exc, tb):
+        self.db.execute("COMMIT" if exc_type is None else "ROLLBACK")
+
+if __name__ == "__main__":
+    commands = ("status", "retry-failed")
+    if len(sys.argv) < 2 or sys.argv[1] not in commands:
+        print("Usage: work_queue.py status|retry-failed [queue.sqlite3]")
+        sys.exit(1)
+
+    work_queue = WorkQueue(sys.argv[2] if len(sys.argv) > 2 else queue_path)
+
+    if sys.argv[1] == "retry-failed":
+        print(f"Requeued {work_queue.retry_failed()} failed tracks")
+    else:
+        print(", ".join(f"{state}: {count}" for state, count in work_queue.counts().items()))
+        for position, spotify_id, attempts, last_error in work_queue.failures():
+            print(f"  {position} {spotify_id} ({attempts} attempts): {last_error}")
@@ -76,7 +76,18 @@ app.get("/callback", async (req, res) => {
 });
 
 // Implement this in every request so that it refreshes
-const refresh_token = async () => {
+// Crawl lanes (multi_lane_crawl.py) need their own account each: PLAYER_REFRESH_TOKEN_<lane>
+const refresh_token = async (lane) => {
+  const token =
+    lane === undefined
+      ? process.env.PLAYER_REFRESH_TOKEN
+      : process.env[`PLAYER_REFRESH_TOKEN_${lane}`];
+
+  if (!token) {
+    const name = lane === undefined ? "PLAYER_REFRESH_TOKEN" : `PLAYER_REFRESH_TOKEN_${lane}`;
+    throw new Error(`${name} is not set.`);
+  }
+
   const response = await fetch("https://accounts.spotify.com/api/token", {
     method: "POST",
     headers: {
@@ -91,7 +102,7 @@ const refresh_token = async () => {
     },
     body: new URLSearchParams({
       grant_type: "refresh_token",
-      refresh_token: process.env.PLAYER_REFRESH_TOKEN,
+      refresh_token: token,
     }),
   });
 
@@ -100,12 +111,21 @@ const refresh_token = async () => {
   return data;
 };
 
-console.log("Refresh Token: ", await refresh_token());
+// Only a check at boot: a setup with lane tokens alone has no PLAYER_REFRESH_TOKEN
+try {
+  console.log("Refresh Token: ", await refresh_token());
+} catch (error) {
+  console.error("Refresh Token: ", error.message);
+}
 
 app.get("/auth/token", async (req, res) => {
-  const response = await refresh_token();
+  try {
+    const response = await refresh_token(req.query.lane);
 
-  res.status(200).json({ message: "Retrieved token.", token: response });
+    res.status(200).json({ message: "Retrieved token.", token: response });
+  } catch (error) {
+    res.status(500).json({ message: error.message });
+  }
 });
 
 /**************************************** IMPLEMENTATION ****************************************/
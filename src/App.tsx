@@ -8,7 +8,11 @@ const App = () => {
 
   useEffect(() => {
     const getToken = async () => {
-      const response = await axios.get("http://localhost:3000/auth/token");
+      // Every crawl lane plays on its own Spotify account (one playback device per account)
+      const lane = new URLSearchParams(window.location.search).get("lane");
+      const response = await axios.get("http://localhost:3000/auth/token", {
+        params: lane === null ? {} : { lane: lane },
+      });
 
       // console.log("Reponse: ", response.data.token.access_token);
 
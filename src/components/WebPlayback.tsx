@@ -13,6 +13,11 @@ interface Props {
   token: string;
 }
 
+// Crawl lane (?lane=k, set by multi_lane_crawl.py): each lane has its own filewatcher on port 8090 + k
+const lane = new URLSearchParams(window.location.search).get("lane");
+const filewatcherUrl =
+  lane === null ? "ws://localhost:8080" : `ws://localhost:${8090 + Number(lane)}`;
+
 const WebPlayback = ({ token }: Props) => {
   const playerRef = useRef<any>(null);
   const deviceIdRef = useRef<any>(null);
@@ -30,7 +35,7 @@ const WebPlayback = ({ token }: Props) => {
     let reconnectTimeout: NodeJS.Timeout;
 
     const connect = () => {
-      ws = new WebSocket("ws://localhost:8080");
+      ws = new WebSocket(filewatcherUrl);
 
       ws.onopen = () => {
         console.log("Connected to wss");